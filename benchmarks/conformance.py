@@ -0,0 +1,129 @@
+'''
+Checks that the "c" and "numpy" backends agree on random
+(F, modulus) inputs, and compares how long each backend
+spends in each kernel.
+
+Run from the ORBITVIS directory:
+python -m benchmarks.conformance <objects directory> [trials] [seed]
+
+October 18, 2026
+'''
+
+import random
+import sys
+from time import perf_counter
+
+from ctypes import *
+
+from orbitkernels import CBackend
+from orbitkernels import NumpyBackend
+
+MAXMODULUS = 60
+
+#Screens are much slower than single kernels, so check fewer of them
+#and keep their moduli small
+SCREENEVERY = 10
+MAXSCREENMODULUS = 25
+
+KERNELS = ["C_step", "get_orbit_info", "get_orbit_info_array", "C_iterate_matrix", "orbit_info_rows"]
+
+
+def make_matrix(entries):
+	'''Returns a 2x2 ctypes matrix with the given entries, listed row-wise.'''
+
+	return ((c_int * 2) * 2)((c_int*2)(entries[0], entries[1]), (c_int*2)(entries[2], entries[3]))
+
+
+def run_kernel(backend, kernel, args):
+	'''Runs a kernel on a backend, returning its result and
+	how long it took. Matrix arguments are copied first, since
+	some kernels change them in place.'''
+
+	args = [make_matrix([a[0][0], a[0][1], a[1][0], a[1][1]]) if isinstance(a, (c_int * 2) * 2) else a
+	        for a in args]
+
+	start = perf_counter()
+	result = getattr(backend, kernel)(*args)
+	elapsed = perf_counter() - start
+
+	#C_iterate_matrix gives its result by changing currentF
+	if kernel == "C_iterate_matrix":
+		result = [[args[1][0][0], args[1][0][1]], [args[1][1][0], args[1][1][1]]]
+	elif kernel == "orbit_info_rows":
+		result = result.tolist()
+
+	return result, elapsed
+
+
+def random_inputs(kernel, generator):
+	'''Returns a random modulus and random arguments
+	for the given kernel.'''
+
+	if kernel == "orbit_info_rows":
+		modulus = generator.randint(1, MAXSCREENMODULUS)
+	else:
+		modulus = generator.randint(1, MAXMODULUS)
+
+	F = make_matrix([generator.randrange(modulus) for e in range(0, 4)])
+
+	if kernel == "C_step":
+		return modulus, [generator.randrange(modulus), generator.randrange(modulus), F, modulus,
+		                 generator.randint(0, 3*modulus)]
+	elif kernel == "get_orbit_info":
+		return modulus, [(c_int * 2)(generator.randrange(modulus), generator.randrange(modulus)), F, modulus]
+	elif kernel == "get_orbit_info_array":
+		return modulus, [F, modulus]
+	elif kernel == "C_iterate_matrix":
+		return modulus, [F, make_matrix([generator.randrange(modulus) for e in range(0, 4)]), modulus]
+	elif kernel == "orbit_info_rows":
+		xStart = generator.randrange(modulus)
+		return modulus, [F, modulus, generator.choice(["diag", "nondiag"]), xStart,
+		                 generator.randint(xStart + 1, modulus)]
+
+
+if __name__ == "__main__":
+	if len(sys.argv) < 2:
+		print("Usage: python -m benchmarks.conformance <objects directory> [trials] [seed]")
+		quit()
+
+	backends = {"c" : CBackend(sys.argv[1]), "numpy" : NumpyBackend()}
+	trials = 1000
+	if len(sys.argv) > 2:
+		trials = int(sys.argv[2])
+
+	generator = random.Random()
+	if len(sys.argv) > 3:
+		generator.seed(int(sys.argv[3]))
+
+	times = {(name, kernel) : 0 for name in backends for kernel in KERNELS}
+	calls = {kernel : 0 for kernel in KERNELS}
+	mismatches = 0
+
+	for trial in range(0, trials):
+		for kernel in KERNELS:
+			if kernel == "orbit_info_rows" and trial % SCREENEVERY != 0:
+				continue
+
+			modulus, args = random_inputs(kernel, generator)
+			results = {}
+			for name in backends:
+				results[name], elapsed = run_kernel(backends[name], kernel, args)
+				times[(name, kernel)] += elapsed
+			calls[kernel] += 1
+
+			if results["c"] != results["numpy"]:
+				mismatches += 1
+				print("Mismatch in", kernel, "for modulus", modulus)
+
+	print("")
+	print("{:<22} {:>8} {:>14} {:>14}".format("kernel", "calls", "c (s)", "numpy (s)"))
+	for kernel in KERNELS:
+		print("{:<22} {:>8} {:>14.4f} {:>14.4f}".format(kernel, calls[kernel],
+		      times[("c", kernel)], times[("numpy", kernel)]))
+
+	print("")
+	if mismatches == 0:
+		print("Backends agree.")
+	else:
+		print(mismatches, "mismatches found.")
+		sys.exit(1)
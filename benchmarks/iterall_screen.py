@@ -0,0 +1,95 @@
+'''
+Times how long one "iterall" screen takes to compute for
+a range of moduli, using both the old per-tile maxInfo
+rescan and the current single pass.
+
+Run from the ORBITVIS directory:
+python -m benchmarks.iterall_screen <objects directory> [moduli...]
+
+October 18, 2026
+'''
+
+import sys
+from time import perf_counter
+
+from ctypes import *
+
+from orbitkernels import CBackend
+from orbitkernels import orbit_info_screen
+from orbitkernels import screen_maxima
+from orbitkernels import set_screen_matrix
+
+#The old screen is O(M^4) in Python, so don't bother past this
+MAXOLDMODULUS = 80
+
+
+def old_screen(sharedC, F, modulus, arrangement):
+	'''The "iterall" screen computation as it was before,
+	rescanning every tile to update maxInfo after each one.'''
+
+	vectorStates = [[[0, 0] for y in range(0, modulus)] for x in range(0, modulus)]
+	maxInfo = [0, 0]
+
+	for x in range(0, modulus):
+		for y in range(0, modulus):
+			set_screen_matrix(F, x, y, arrangement)
+			vectKey = sharedC.get_orbit_info_array(F, modulus)
+			vectTau = vectKey % (2*modulus)
+			vectOmega = (vectKey - vectTau)//(2*modulus)
+			vectorStates[x][y] = [vectOmega, vectTau]
+
+			maxInfo[0] = 0
+			maxInfo[1] = 0
+			for newX in range(0, modulus):
+				for newY in range(0, modulus):
+					if vectorStates[newX][newY][0] > maxInfo[0]:
+						maxInfo[0] = vectorStates[newX][newY][0]
+
+					if vectorStates[newX][newY][1] > maxInfo[1]:
+						maxInfo[1] = vectorStates[newX][newY][1]
+
+	return vectorStates, maxInfo
+
+
+def new_screen(sharedC, F, modulus, arrangement):
+	'''The current "iterall" screen computation.'''
+
+	screenInfo = orbit_info_screen(sharedC, F, modulus, arrangement)
+	return screenInfo, screen_maxima(screenInfo)
+
+
+def time_screen(screenFunc, sharedC, modulus):
+	'''Returns the time taken by screenFunc for the first
+	"diag" screen of the given modulus, along with its result.'''
+
+	F = ((c_int * 2) * 2)((c_int*2)(1, 0), (c_int*2)(0, 1))
+
+	start = perf_counter()
+	result = screenFunc(sharedC, F, modulus, "diag")
+	return perf_counter() - start, result
+
+
+if __name__ == "__main__":
+	if len(sys.argv) < 2:
+		print("Usage: python -m benchmarks.iterall_screen <objects directory> [moduli...]")
+		quit()
+
+	sharedC = CBackend(sys.argv[1])
+
+	moduli = [int(m) for m in sys.argv[2:]]
+	if moduli == []:
+		moduli = [5, 10, 20, 40, 80, 160]
+
+	print("modulus    before (s)    after (s)")
+	for modulus in moduli:
+		newTime, newResult = time_screen(new_screen, sharedC, modulus)
+
+		if modulus <= MAXOLDMODULUS:
+			oldTime, oldResult = time_screen(old_screen, sharedC, modulus)
+			if oldResult[0] != newResult[0].tolist() or oldResult[1] != newResult[1]:
+				print("Results differ for modulus", modulus)
+			oldTime = "{:.4f}".format(oldTime)
+		else:
+			oldTime = "skipped"
+
+		print("{:<10} {:<13} {:.4f}".format(modulus, oldTime, newTime))
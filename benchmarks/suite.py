@@ -0,0 +1,331 @@
+'''
+Times ORBITVIS' main phases (setting up, iterating, drawing,
+checking for the initial state, and capturing) for every CMODE
+and COLORMODE over a sweep of moduli, using the matrices from the
+screenshots in examples/. Everything runs headless. Each run is
+repeated after a warm-up run, and the median time of each phase
+is kept.
+
+Results are printed and can be saved as JSON. Given an earlier
+JSON file as a baseline, phases which got slower by more than
+the tolerance are reported, and the exit code is 1.
+
+Run from the ORBITVIS directory:
+python -m benchmarks.suite [--backend c|numpy] [--objects <objects directory>]
+       [--moduli M ...] [--steps N] [--captures N] [--repeats N]
+       [--output results.json] [--baseline old.json] [--tolerance 1.25]
+
+October 18, 2026
+'''
+
+'''
+The following resources were used as a reference:
+https://docs.python.org/3.8/library/tracemalloc.html
+https://docs.python.org/3.8/library/argparse.html
+https://docs.python.org/3.8/library/json.html
+'''
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import tracemalloc
+from os import listdir
+from time import perf_counter
+
+import pygame
+
+from orbitcapture import run_capture
+from orbitconfig import Config
+from orbitengine import Engine
+from orbitkernels import make_backend
+from orbitprofile import BATCHKERNELS
+from orbitprofile import count_calls
+from orbitprofile import KERNELS
+from orbitrender import draw_plane
+
+EXAMPLESPATH = "examples"
+
+#Each CMODE with the COLORMODEs that work with it
+MODES = [("iterplane", "drag"), ("iterplane", "repaint"),
+         ("iterstate", "drag"), ("iterstate", "repaint"),
+         ("cycles", "relative"), ("cycles", "rellog"),
+         ("iterall", "relative"), ("iterall", "rellog")]
+
+SURFACESIZE = (600, 600)
+
+#Phases quicker than this (in seconds) are mostly timer noise,
+#so they're never reported as slower
+MINCOMPARETIME = 0.005
+
+
+def matrix_splits(digits, modulus, parts=4):
+	'''Returns every way of splitting digits into the given number of
+	entries, each less than modulus and without leading zeros.'''
+
+	if parts == 0:
+		return [[]] if digits == "" else []
+
+	splits = []
+	for length in range(1, len(digits) + 1):
+		entry = digits[:length]
+		if (len(entry) > 1 and entry[0] == "0") or int(entry) >= modulus:
+			break
+
+		for rest in matrix_splits(digits[length:], modulus, parts - 1):
+			splits.append([int(entry)] + rest)
+
+	return splits
+
+
+def read_examples(examplesPath):
+	'''Reads the matrices out of the example screenshots' names,
+	whose format is given in Examples.txt. Returns a list of
+	(name, cmode, modulus, matrix), where matrix is listed row-wise.
+
+	The entries in a name aren't separated, so names which can be
+	read more than one way are skipped. Four digits can only be read
+	one way, even if some entries weren't reduced by the modulus.'''
+
+	examples = []
+	for name in sorted(listdir(examplesPath)):
+		if not name.startswith("ORBITVIS - ") or not name.endswith(".png"):
+			continue
+
+		info = name[len("ORBITVIS - "):-len(".png")]
+
+		#m<modulus> from F<first matrix> to F<last matrix>
+		if " from F" in info:
+			cmode = "iterall"
+			modulus = int(info[1:info.index(" ")])
+			digits = info[info.index(" from F") + len(" from F"):info.index(" to F")]
+
+		#i<iteration>m<modulus>F<matrix>
+		else:
+			cmode = "iterstate"
+			modulus = int(info[info.index("m") + 1:info.index("F")])
+			digits = info[info.index("F") + 1:]
+
+		if len(digits) == 4:
+			splits = [[int(digit) for digit in digits]]
+		else:
+			splits = matrix_splits(digits, modulus)
+		if len(splits) == 1:
+			examples.append((name, cmode, modulus, splits[0]))
+		else:
+			print("Skipping", name, "(its matrix can be read", len(splits), "ways)")
+
+	return examples
+
+
+def make_config(args, cmode, colormode, modulus, matrixPath, capturePath):
+	'''Returns the Config for one benchmark run.'''
+
+	config = Config()
+	config.CMODE = cmode
+	config.COLORMODE = colormode
+	config.MODULUS = modulus
+	config.MATRIXPATH = matrixPath
+	config.BACKEND = args.backend
+	config.OBJECTPATH = args.objects
+	config.CAPTUREMODE = True
+	config.HEADLESS = True
+	config.CAPTUREPATH = capturePath
+	config.maxcaptures = args.captures
+	config.windowDimensions = list(SURFACESIZE)
+
+	#iterall examples pick out a screen with the nondiagonal entries
+	config.ARRANGEMENT = "nondiag"
+
+	return config
+
+
+def time_run(args, cmode, colormode, modulus, matrix, workPath, traceMemory=False):
+	'''Times each phase of ORBITVIS for one mode, modulus and matrix.
+	Returns the results as a dictionary.
+
+	If traceMemory is True, the peak memory allocated during the run is
+	recorded too. Tracing slows allocations down, so the timings from a
+	traced run shouldn't be used.'''
+
+	matrix = [entry % modulus for entry in matrix]
+	matrixPath = workPath + "/update.matrix"
+	matrixData = open(matrixPath, "w")
+	matrixData.write("2 2\n" + str(matrix[0]) + " " + str(matrix[1]) + "\n" +
+	                 str(matrix[2]) + " " + str(matrix[3]) + "\n")
+	matrixData.close()
+
+	config = make_config(args, cmode, colormode, modulus, matrixPath, workPath + "/captures")
+	surface = pygame.Surface(SURFACESIZE)
+	phases = {}
+	calls = {name : 0 for name in KERNELS + BATCHKERNELS}
+
+	if traceMemory:
+		tracemalloc.start()
+
+	#Counted from the start, so the calls made setting up are included
+	start = perf_counter()
+	backend = make_backend(args.backend, args.objects)
+	count_calls(backend, calls)
+	engine = Engine(config, backend=backend)
+	if cmode == "iterall":
+		engine.F[0][1] = matrix[1]
+		engine.F[1][0] = matrix[2]
+		engine.iterate_plane()
+	phases["setup"] = perf_counter() - start
+
+	#"cycles" looks the same on every iteration, so recompute it instead
+	start = perf_counter()
+	for step in range(0, args.steps):
+		if cmode == "cycles":
+			engine.iterate_plane()
+		else:
+			engine.step()
+	phases["iterate"] = perf_counter() - start
+
+	start = perf_counter()
+	for step in range(0, args.steps):
+		draw_plane(surface, engine)
+	phases["draw"] = perf_counter() - start
+
+	start = perf_counter()
+	for step in range(0, args.steps):
+		engine.is_initial_state()
+	phases["initial"] = perf_counter() - start
+
+	#CAPTUREMODE doesn't work with "cycles"
+	if cmode != "cycles":
+		engine.reset()
+		start = perf_counter()
+		run_capture(engine, surface, False)
+		phases["capture"] = perf_counter() - start
+
+	peakMemory = None
+	if traceMemory:
+		peakMemory = tracemalloc.get_traced_memory()[1]
+		tracemalloc.stop()
+	engine.close()
+
+	return {"cmode" : cmode, "colormode" : colormode, "modulus" : modulus, "matrix" : matrix,
+	        "phases" : phases, "calls" : calls, "peakMemory" : peakMemory}
+
+
+def time_repeated(args, cmode, colormode, modulus, matrix, workPath):
+	'''Runs time_run() once to warm up, then args.repeats more times.
+	Returns the results of the first timed run, with each phase's time
+	replaced by its median over the timed runs.'''
+
+	time_run(args, cmode, colormode, modulus, matrix, workPath)
+
+	runs = [time_run(args, cmode, colormode, modulus, matrix, workPath)
+	        for repeat in range(0, max(args.repeats, 1))]
+
+	run = runs[0]
+	run["phases"] = {phase : statistics.median([timed["phases"][phase] for timed in runs])
+	                 for phase in run["phases"]}
+
+	return run
+
+
+def run_key(run):
+	'''Returns what identifies a run when comparing against a baseline.'''
+
+	return (run["cmode"], run["colormode"], run["modulus"], tuple(run["matrix"]))
+
+
+def compare(results, baseline, tolerance):
+	'''Prints how each phase compares with the baseline.
+	Returns how many phases got slower than the tolerance allows.'''
+
+	baselineRuns = {run_key(run) : run for run in baseline["runs"]}
+	regressions = 0
+
+	print("")
+	print("{:<10} {:<9} {:>6} {:<8} {:>10} {:>10} {:>7}".format(
+	      "cmode", "colormode", "mod", "phase", "base (s)", "now (s)", "ratio"))
+	for run in results["runs"]:
+		if run_key(run) not in baselineRuns:
+			continue
+
+		oldRun = baselineRuns[run_key(run)]
+		for phase in run["phases"]:
+			if phase not in oldRun["phases"]:
+				continue
+
+			old = oldRun["phases"][phase]
+			new = run["phases"][phase]
+			ratio = new/old if old > 0 else 1
+
+			flag = ""
+			if ratio > tolerance and max(old, new) >= MINCOMPARETIME:
+				flag = " slower"
+				regressions += 1
+
+			print("{:<10} {:<9} {:>6} {:<8} {:>10.4f} {:>10.4f} {:>7.2f}{}".format(
+			      run["cmode"], run["colormode"], run["modulus"], phase, old, new, ratio, flag))
+
+	return regressions
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Benchmarks ORBITVIS' main phases.")
+	parser.add_argument("--backend", default="c", choices=["c", "numpy"])
+	parser.add_argument("--objects", default="", help="directory holding orbitvis.so")
+	parser.add_argument("--moduli", type=int, nargs="*",
+	                    help="moduli to sweep over (defaults to the examples' own moduli)")
+	parser.add_argument("--steps", type=int, default=10, help="iterations timed per phase")
+	parser.add_argument("--captures", type=int, default=5, help="screenshots taken in the capture phase")
+	parser.add_argument("--repeats", type=int, default=5,
+	                    help="timed runs per mode and modulus, after a warm-up run")
+	parser.add_argument("--output", help="where to save the results as JSON")
+	parser.add_argument("--baseline", help="earlier results to compare against")
+	parser.add_argument("--tolerance", type=float, default=1.25,
+	                    help="how many times slower a phase can get before it's reported")
+	args = parser.parse_args()
+
+	examples = read_examples(EXAMPLESPATH)
+	results = {"backend" : args.backend, "steps" : args.steps, "captures" : args.captures,
+	           "repeats" : args.repeats, "python" : platform.python_version(), "runs" : []}
+
+	print("{:<10} {:<9} {:>6} {:>9} {:>9} {:>9} {:>9} {:>9} {:>9} {:>10}".format(
+	      "cmode", "colormode", "mod", "setup", "iterate", "draw", "initial", "capture", "calls", "peak (MB)"))
+
+	with tempfile.TemporaryDirectory() as workPath:
+		for cmode, colormode in MODES:
+			for name, exampleCmode, exampleModulus, matrix in examples:
+				#iterall examples are screens, the rest are vector planes
+				if (exampleCmode == "iterall") != (cmode == "iterall"):
+					continue
+
+				moduli = args.moduli if args.moduli else [exampleModulus]
+				for modulus in moduli:
+					run = time_repeated(args, cmode, colormode, modulus, matrix, workPath)
+					run["peakMemory"] = time_run(args, cmode, colormode, modulus, matrix, workPath,
+					                             True)["peakMemory"]
+					results["runs"].append(run)
+
+					phases = run["phases"]
+					print("{:<10} {:<9} {:>6} {:>9.4f} {:>9.4f} {:>9.4f} {:>9.4f} {:>9} {:>9} {:>10.1f}".format(
+					      cmode, colormode, modulus, phases["setup"], phases["iterate"], phases["draw"],
+					      phases["initial"], "{:.4f}".format(phases["capture"]) if "capture" in phases else "-",
+					      sum(run["calls"].values()), run["peakMemory"]/2**20))
+
+	if args.output:
+		outputFile = open(args.output, "w")
+		json.dump(results, outputFile, indent=1)
+		outputFile.close()
+
+	if args.baseline:
+		baselineFile = open(args.baseline)
+		baseline = json.load(baselineFile)
+		baselineFile.close()
+
+		regressions = compare(results, baseline, args.tolerance)
+		print("")
+		if regressions == 0:
+			print("No phase got slower than the tolerance allows.")
+		else:
+			print(regressions, "phases got slower than the tolerance allows.")
+			sys.exit(1)
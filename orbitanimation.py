@@ -0,0 +1,227 @@
+'''
+Writes and reads ORBITVIS animation files, which hold a whole
+CAPTUREMODE run in one file instead of one PNG per frame.
+
+Each frame is stored as the difference (XOR) between its pixels and
+the previous frame's, so parts of the plane which don't change cost
+almost nothing. Every KEYFRAMEINTERVAL frames a whole frame is stored
+instead, so a frame can be read without decoding everything before it.
+Each pixel is then XORed with its neighbours above and to the left,
+which leaves only the edges of tiles, before compressing with zlib.
+
+Frames are stored one after another, each with a small header
+giving its size, so the index of frames is rebuilt by skipping
+from header to header. A file cut short by a crash can still be
+read up to its last whole frame.
+
+To turn an animation file back into PNGs, run:
+python orbitanimation.py <animation file> [output directory]
+
+October 18, 2026
+'''
+
+'''
+The following resources were used as a reference:
+https://docs.python.org/3.8/library/struct.html
+https://docs.python.org/3.8/library/zlib.html
+https://www.pygame.org/docs/ref/surfarray.html#pygame.surfarray.array3d
+'''
+
+import struct
+import sys
+import zlib
+
+from os.path import dirname
+from os.path import exists
+from os import makedirs
+
+import numpy as np
+
+MAGIC = b"ORBITVIS animation 1\n"
+EXCEPTIONnotANIMATION = "File isn't an ORBITVIS animation file."
+
+#Width, height, whether it's a keyframe, length of the name, length of the data
+FRAMEHEADER = struct.Struct("<HHBHI")
+
+#How many frames apart whole frames are stored
+KEYFRAMEINTERVAL = 256
+
+#zlib compression level; levels above 6 are much slower for little gain
+COMPRESSION = 6
+
+
+def filter_edges(pixels):
+	'''XORs each pixel with the one above it, then with the one to its
+	left, so that blocks of one colour become zeros except at their edges.'''
+
+	filtered = pixels.copy()
+	filtered[:, 1:] ^= pixels[:, :-1]
+
+	edges = filtered.copy()
+	edges[1:] ^= filtered[:-1]
+
+	return edges
+
+
+def unfilter_edges(edges):
+	'''Undoes filter_edges().'''
+
+	return np.bitwise_xor.accumulate(np.bitwise_xor.accumulate(edges, axis=0), axis=1)
+
+
+class AnimationFile:
+	'''Writes frames to a new animation file at path.'''
+
+	def __init__(self, path):
+		if dirname(path) != "" and not exists(dirname(path)):
+			makedirs(dirname(path))
+
+		self.file = open(path, "wb")
+		self.file.write(MAGIC)
+
+		self.previous = None
+		self.frames = 0
+
+
+	def add_frame(self, pixels, name):
+		'''Adds a frame to the end of the file. pixels is an array of
+		shape (width, height, 3), as from pygame.surfarray.array3d(),
+		and name is what the frame's PNG would have been called.'''
+
+		width, height = pixels.shape[0], pixels.shape[1]
+		pixels = np.ascontiguousarray(pixels, dtype=np.uint8)
+
+		keyframe = (self.frames % KEYFRAMEINTERVAL == 0 or self.previous is None or
+		            self.previous.shape != pixels.shape)
+		if keyframe:
+			difference = pixels
+		else:
+			difference = np.bitwise_xor(pixels, self.previous)
+		data = zlib.compress(filter_edges(difference).tobytes(), COMPRESSION)
+
+		nameData = name.encode("utf-8")
+		self.file.write(FRAMEHEADER.pack(width, height, keyframe, len(nameData), len(data)))
+		self.file.write(nameData)
+		self.file.write(data)
+
+		self.previous = pixels
+		self.frames += 1
+
+
+	def close(self):
+		'''Finishes writing the file.'''
+
+		self.file.close()
+
+
+class AnimationReader:
+	'''Reads frames from the animation file at path.'''
+
+	def __init__(self, path):
+		self.file = open(path, "rb")
+		if self.file.read(len(MAGIC)) != MAGIC:
+			self.file.close()
+			raise Exception(EXCEPTIONnotANIMATION)
+
+		#(where the frame's data starts, width, height, keyframe, data length) for each frame
+		self.index = []
+		self.names = []
+
+		fileSize = self.file.seek(0, 2)
+		self.file.seek(len(MAGIC))
+
+		while True:
+			header = self.file.read(FRAMEHEADER.size)
+			if len(header) < FRAMEHEADER.size:
+				break
+
+			width, height, keyframe, nameLength, dataLength = FRAMEHEADER.unpack(header)
+			name = self.file.read(nameLength)
+			start = self.file.tell()
+
+			#Frame was cut short
+			if start + dataLength > fileSize:
+				break
+			self.file.seek(start + dataLength)
+
+			self.index.append((start, width, height, bool(keyframe), dataLength))
+			self.names.append(name.decode("utf-8"))
+
+		#The last frame decoded, so reading frames in order is quick
+		self.lastFrame = -1
+		self.lastPixels = None
+
+
+	def __len__(self):
+		return len(self.index)
+
+
+	def read_data(self, frame):
+		'''Returns the decompressed data of a frame, before undoing the
+		difference from the previous frame, shaped (width, height, 3).'''
+
+		start, width, height, keyframe, dataLength = self.index[frame]
+		self.file.seek(start)
+		data = zlib.decompress(self.file.read(dataLength))
+
+		return unfilter_edges(np.frombuffer(data, dtype=np.uint8).reshape((width, height, 3)))
+
+
+	def frame(self, frame):
+		'''Returns the pixels of a frame, as an array of shape
+		(width, height, 3).'''
+
+		#Start from the nearest keyframe, unless the last frame read is closer
+		first = frame
+		while not self.index[first][3]:
+			first -= 1
+
+		if first <= self.lastFrame <= frame:
+			pixels = self.lastPixels
+			first = self.lastFrame + 1
+		else:
+			pixels = None
+
+		for f in range(first, frame + 1):
+			data = self.read_data(f)
+			if self.index[f][3]:
+				pixels = data
+			else:
+				pixels = np.bitwise_xor(pixels, data)
+
+		self.lastFrame = frame
+		self.lastPixels = pixels
+
+		return pixels
+
+
+	def close(self):
+		self.file.close()
+
+
+if __name__ == "__main__":
+	if len(sys.argv) < 2 or not exists(sys.argv[1]):
+		print("Usage: python orbitanimation.py <animation file> [output directory]")
+		quit()
+
+	reader = AnimationReader(sys.argv[1])
+
+	if len(sys.argv) < 3:
+		print(len(reader), "frames")
+		for f in range(0, len(reader)):
+			start, width, height, keyframe, dataLength = reader.index[f]
+			print(reader.names[f], "(" + str(width) + "x" + str(height) + ",",
+			      "keyframe," if keyframe else "difference,", dataLength, "bytes)")
+
+	else:
+		import pygame
+
+		if not exists(sys.argv[2]):
+			makedirs(sys.argv[2])
+
+		for f in range(0, len(reader)):
+			pygame.image.save(pygame.surfarray.make_surface(reader.frame(f)),
+			                  sys.argv[2] + "/" + reader.names[f] + ".png")
+		print("Saved", len(reader), "frames to", sys.argv[2])
+
+	reader.close()
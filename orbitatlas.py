@@ -0,0 +1,147 @@
+'''
+Builds and reads orbit atlases. An atlas holds (omega, tau)
+for every matrix mod a prime power, so "iterall" screens can be
+sliced straight out of it instead of being computed. Screens for
+other moduli are pieced together from the atlases of their prime
+powers (see orbitfactor.py).
+
+To build the atlases needed for a modulus, run:
+python orbitatlas.py <atlas directory> <modulus> [backend] [objects directory] [workers]
+
+October 18, 2026
+'''
+
+'''
+The following resources were used as a reference:
+https://numpy.org/doc/stable/reference/generated/numpy.lib.format.open_memmap.html
+https://numpy.org/doc/stable/reference/generated/numpy.load.html
+https://docs.python.org/3.8/library/os.html#os.replace
+'''
+
+import sys
+
+from os.path import exists
+from os import makedirs
+from os import replace
+
+from ctypes import *
+
+import numpy as np
+
+from orbitkernels import make_backend
+from orbitkernels import orbit_info_screen
+from orbitmath import prime_power_factors
+from orbitworkers import make_pool
+from orbitworkers import orbit_info_screen_parallel
+
+#Atlases take 8*primePower^4 bytes, so bigger prime powers aren't built
+MAXATLASPRIMEPOWER = 100
+
+
+def atlas_path(atlasDirectory, primePower):
+	'''Returns where the atlas for primePower is kept.'''
+
+	return atlasDirectory + "/atlas" + str(primePower) + ".npy"
+
+
+def build_atlas(atlasDirectory, primePower, backend, pool=None, workers=1):
+	'''Computes (omega, tau) for every matrix mod primePower and saves
+	them to an atlas of shape (p, p, p, p, 2), indexed by the entries
+	of the matrix row-wise. Screens are shared out between pool's
+	workers if pool isn't None.
+
+	The atlas is written under a temporary name and only renamed once
+	it's finished, so an interrupted build is never read.'''
+
+	if not exists(atlasDirectory):
+		makedirs(atlasDirectory)
+
+	partialPath = atlas_path(atlasDirectory, primePower) + ".partial"
+	atlas = np.lib.format.open_memmap(partialPath, mode="w+", dtype=np.uint32,
+	                                  shape=(primePower,)*4 + (2,))
+
+	#Each (b, c) is one "nondiag" screen, varying a and d
+	F = ((c_int * 2) * 2)()
+	for b in range(0, primePower):
+		for c in range(0, primePower):
+			F[0][1] = b
+			F[1][0] = c
+
+			if pool is not None:
+				atlas[:, b, c, :] = orbit_info_screen_parallel(pool, workers, F, primePower, "nondiag")
+			else:
+				atlas[:, b, c, :] = orbit_info_screen(backend, F, primePower, "nondiag")
+
+	atlas.flush()
+	del atlas
+	replace(partialPath, atlas_path(atlasDirectory, primePower))
+
+
+def load_atlases(atlasDirectory, modulus):
+	'''Returns a dictionary holding the memory-mapped atlas for each
+	prime power of modulus which has one in atlasDirectory.'''
+
+	atlases = {}
+	if atlasDirectory == "":
+		return atlases
+
+	for primePower in prime_power_factors(modulus):
+		path = atlas_path(atlasDirectory, primePower)
+		if exists(path):
+			atlas = np.load(path, mmap_mode="r")
+			if atlas.shape == (primePower,)*4 + (2,):
+				atlases[primePower] = atlas
+
+	return atlases
+
+
+def atlas_screen(atlas, F, arrangement):
+	'''Slices the "iterall" screen containing F out of an atlas,
+	in the same form as orbit_info_screen. F's entries should
+	already be reduced by the atlas' prime power.'''
+
+	if arrangement == "nondiag":
+		screenInfo = atlas[:, F[0][1], F[1][0], :]
+	elif arrangement == "diag":
+		screenInfo = atlas[F[0][0], :, :, F[1][1]]
+
+	return screenInfo.astype(np.int64)
+
+
+def atlas_matrix_info(atlas, F):
+	'''Returns [omega, tau] for F from an atlas. F's entries
+	should already be reduced by the atlas' prime power.'''
+
+	return [int(i) for i in atlas[F[0][0], F[0][1], F[1][0], F[1][1]]]
+
+
+if __name__ == "__main__":
+	if len(sys.argv) < 3:
+		print("Usage: python orbitatlas.py <atlas directory> <modulus> [backend] [objects directory] [workers]")
+		quit()
+
+	backendName = "numpy"
+	if len(sys.argv) > 3:
+		backendName = sys.argv[3]
+
+	objectPath = ""
+	if len(sys.argv) > 4:
+		objectPath = sys.argv[4]
+
+	workers = 1
+	if len(sys.argv) > 5:
+		workers = int(sys.argv[5])
+
+	backend = make_backend(backendName, objectPath)
+	pool = None
+	if workers > 1:
+		pool = make_pool(backendName, objectPath, workers)
+
+	for primePower in prime_power_factors(int(sys.argv[2])):
+		if exists(atlas_path(sys.argv[1], primePower)):
+			print("Atlas for", primePower, "already built.")
+		elif primePower > MAXATLASPRIMEPOWER:
+			print("Skipping", primePower, "(atlases are only built up to " + str(MAXATLASPRIMEPOWER) + ").")
+		else:
+			print("Building atlas for", primePower, "...")
+			build_atlas(sys.argv[1], primePower, backend, pool, workers)
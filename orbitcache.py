@@ -0,0 +1,271 @@
+'''
+A persistent cache for the cycle and transient lengths of
+matrices, shared between runs of ORBITVIS. Entries are keyed
+by the modulus and the four entries of the matrix.
+
+Also holds a smaller in-memory cache of whole "iterall"
+screens, which screens can be prefetched into.
+
+October 18, 2026
+'''
+
+'''
+The following resources were used as a reference:
+https://docs.python.org/3.8/library/sqlite3.html
+https://www.sqlite.org/lang_createindex.html
+https://docs.python.org/3.8/library/collections.html#collections.OrderedDict
+'''
+
+import sqlite3
+
+from collections import OrderedDict
+from threading import Lock
+
+from os.path import dirname
+from os.path import exists
+from os import makedirs
+
+import numpy as np
+
+from orbitkernels import set_screen_matrix
+
+#How many lookups can update when matrices were last used before they're committed
+COMMITINTERVAL = 256
+
+
+class OrbitCache:
+	'''Stores (omega, tau) for matrices in an SQLite database.
+
+	Once the cache holds more than maxEntries matrices, the least
+	recently used ones are evicted. hits and misses count how many
+	matrices were (or weren't) found in the cache.
+
+	When matrices were last used is only committed every COMMITINTERVAL
+	lookups (and on close()), so finding a matrix doesn't wait on the disk.'''
+
+	def __init__(self, path, maxEntries):
+		if dirname(path) != "" and not exists(dirname(path)):
+			makedirs(dirname(path))
+
+		self.database = sqlite3.connect(path)
+		self.maxEntries = maxEntries
+		self.hits = 0
+		self.misses = 0
+
+		self.database.execute('''CREATE TABLE IF NOT EXISTS orbits (
+			modulus INTEGER, a INTEGER, b INTEGER, c INTEGER, d INTEGER,
+			omega INTEGER, tau INTEGER, used INTEGER,
+			PRIMARY KEY (modulus, a, b, c, d))''')
+
+		#One index for each "iterall" arrangement, so screens can be read at once
+		self.database.execute("CREATE INDEX IF NOT EXISTS diagScreens ON orbits (modulus, a, d)")
+		self.database.execute("CREATE INDEX IF NOT EXISTS nondiagScreens ON orbits (modulus, b, c)")
+		self.database.execute("CREATE INDEX IF NOT EXISTS lastUsed ON orbits (used)")
+		self.database.commit()
+
+		#Acts as a clock for deciding what was used least recently
+		self.clock = self.database.execute("SELECT MAX(used) FROM orbits").fetchone()[0] or 0
+
+		#Kept here so that storing matrices doesn't have to count the table
+		self.entries = self.database.execute("SELECT COUNT(*) FROM orbits").fetchone()[0]
+		self.uncommitted = 0
+
+
+	def lookup(self, F, modulus):
+		'''Returns [omega, tau] for F, or None if it isn't cached.'''
+
+		key = (modulus, F[0][0], F[0][1], F[1][0], F[1][1])
+		row = self.database.execute('''SELECT omega, tau FROM orbits
+			WHERE modulus=? AND a=? AND b=? AND c=? AND d=?''', key).fetchone()
+
+		if row is None:
+			self.misses += 1
+			return None
+
+		self.hits += 1
+		self.clock += 1
+		self.database.execute('''UPDATE orbits SET used=?
+			WHERE modulus=? AND a=? AND b=? AND c=? AND d=?''', (self.clock,) + key)
+		self.commit_later()
+		return list(row)
+
+
+	def store(self, F, modulus, omega, tau):
+		'''Adds the cycle and transient lengths of F to the cache.'''
+
+		self.clock += 1
+		key = (modulus, F[0][0], F[0][1], F[1][0], F[1][1])
+		added = self.database.execute("INSERT OR IGNORE INTO orbits VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+			key + (omega, tau, self.clock)).rowcount
+
+		if added == 0:
+			self.database.execute('''UPDATE orbits SET omega=?, tau=?, used=?
+				WHERE modulus=? AND a=? AND b=? AND c=? AND d=?''', (omega, tau, self.clock) + key)
+
+		self.entries += added
+		self.evict()
+		self.commit()
+
+
+	def screen_query(self, F, modulus, arrangement):
+		'''Returns the columns which vary across an "iterall" screen,
+		and the condition selecting that screen from the cache.'''
+
+		if arrangement == "nondiag":
+			return "a, d", "modulus=? AND b=? AND c=?", (modulus, F[0][1], F[1][0])
+		elif arrangement == "diag":
+			return "b, c", "modulus=? AND a=? AND d=?", (modulus, F[0][0], F[1][1])
+
+
+	def lookup_screen(self, F, modulus, arrangement):
+		'''Returns the omega/tau table for the "iterall" screen containing F,
+		in the same form as orbit_info_screen, or None if any of the screen's
+		matrices aren't cached.'''
+
+		columns, condition, key = self.screen_query(F, modulus, arrangement)
+		rows = self.database.execute("SELECT " + columns + ", omega, tau FROM orbits WHERE " +
+			condition, key).fetchall()
+
+		if len(rows) < modulus*modulus:
+			self.misses += modulus*modulus - len(rows)
+			self.hits += len(rows)
+			return None
+
+		rows = np.array(rows, dtype=np.int64)
+		screenInfo = np.zeros((modulus, modulus, 2), dtype=np.int64)
+		screenInfo[rows[:, 0], rows[:, 1]] = rows[:, 2:]
+
+		self.hits += modulus*modulus
+		self.clock += 1
+		self.database.execute("UPDATE orbits SET used=? WHERE " + condition, (self.clock,) + key)
+		self.commit_later()
+		return screenInfo
+
+
+	def store_screen(self, F, modulus, arrangement, screenInfo):
+		'''Adds every matrix on an "iterall" screen to the cache.'''
+
+		self.clock += 1
+		entries = [[F[0][0], F[0][1]], [F[1][0], F[1][1]]]
+		rows = []
+		for x in range(0, modulus):
+			for y in range(0, modulus):
+				set_screen_matrix(entries, x, y, arrangement)
+				rows.append((modulus, entries[0][0], entries[0][1], entries[1][0], entries[1][1],
+					int(screenInfo[x, y, 0]), int(screenInfo[x, y, 1]), self.clock))
+
+		added = self.database.executemany("INSERT OR IGNORE INTO orbits VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+			rows).rowcount
+
+		#Some of the screen was cached already
+		if added < len(rows):
+			self.database.executemany('''UPDATE orbits SET omega=?, tau=?, used=?
+				WHERE modulus=? AND a=? AND b=? AND c=? AND d=?''', [row[5:] + row[:5] for row in rows])
+
+		self.entries += added
+		self.evict()
+		self.commit()
+
+
+	def evict(self):
+		'''Removes the least recently used matrices until the
+		cache is back under its size limit.'''
+
+		if self.maxEntries < 0:
+			return
+
+		excess = self.entries - self.maxEntries
+		if excess > 0:
+			self.entries -= self.database.execute('''DELETE FROM orbits WHERE rowid IN
+				(SELECT rowid FROM orbits ORDER BY used LIMIT ?)''', (excess,)).rowcount
+
+
+	def commit_later(self):
+		'''Commits once COMMITINTERVAL lookups have gone uncommitted.'''
+
+		self.uncommitted += 1
+		if self.uncommitted >= COMMITINTERVAL:
+			self.commit()
+
+
+	def commit(self):
+		'''Commits every change made so far.'''
+
+		self.database.commit()
+		self.uncommitted = 0
+
+
+	def close(self):
+		'''Saves and closes the cache.'''
+
+		self.commit()
+		self.database.close()
+
+
+
+def screen_key(F, modulus, arrangement):
+	'''Returns what identifies the "iterall" screen containing F.'''
+
+	if arrangement == "nondiag":
+		return (modulus, arrangement, F[0][1], F[1][0])
+	elif arrangement == "diag":
+		return (modulus, arrangement, F[0][0], F[1][1])
+
+
+class ScreenCache:
+	'''Keeps the omega/tau tables of the maxScreens most recently
+	used "iterall" screens in memory. hits and misses count how many
+	screens were (or weren't) found when looked up.
+
+	Screens can be stored from other threads while it's in use.'''
+
+	def __init__(self, maxScreens):
+		self.maxScreens = maxScreens
+		self.screens = OrderedDict()
+		self.screensLock = Lock()
+		self.hits = 0
+		self.misses = 0
+
+
+	def lookup(self, F, modulus, arrangement):
+		'''Returns the omega/tau table for the screen containing F,
+		or None if it isn't cached.'''
+
+		key = screen_key(F, modulus, arrangement)
+		with self.screensLock:
+			if key not in self.screens:
+				self.misses += 1
+				return None
+
+			self.hits += 1
+			self.screens.move_to_end(key)
+			return self.screens[key]
+
+
+	def contains(self, F, modulus, arrangement):
+		'''Returns True if the screen containing F is cached,
+		without counting it as a hit or miss.'''
+
+		with self.screensLock:
+			return screen_key(F, modulus, arrangement) in self.screens
+
+
+	def store(self, F, modulus, arrangement, screenInfo):
+		'''Adds the screen containing F to the cache, evicting the
+		least recently used screen if there are too many.'''
+
+		with self.screensLock:
+			self.screens[screen_key(F, modulus, arrangement)] = screenInfo
+			self.screens.move_to_end(screen_key(F, modulus, arrangement))
+
+			while len(self.screens) > self.maxScreens:
+				self.screens.popitem(last=False)
+
+
+	def hit_rate(self):
+		'''Returns the fraction of lookups which found their screen.'''
+
+		if self.hits + self.misses == 0:
+			return 0
+
+		return self.hits/(self.hits + self.misses)
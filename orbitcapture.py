@@ -0,0 +1,317 @@
+'''
+Saves CAPTUREMODE screenshots on background threads,
+so PNG encoding and disk writes don't hold up the
+computation of the next plane.
+
+run_capture() runs a whole CAPTUREMODE session for an Engine.
+"iterall" captures can also be run as a job shared between
+processes (see orbitjobs.py), and any capture can be saved to a
+single animation file instead of PNGs (see orbitanimation.py).
+
+October 18, 2026
+'''
+
+'''
+The following resources were used as a reference:
+https://docs.python.org/3.8/library/queue.html
+https://docs.python.org/3.8/library/threading.html
+https://docs.python.org/3.8/library/os.html#os.replace
+'''
+
+from queue import Queue
+from threading import Thread
+
+from os.path import basename
+from os.path import dirname
+from os.path import exists
+from os.path import join
+from os import makedirs
+from os import replace
+
+import pygame
+
+from orbitanimation import AnimationFile
+from orbitjobs import CaptureJob
+from orbitjobs import capture_manifest
+from orbitmath import frames_until_initial
+from orbitprofile import NoProfiler
+from orbitrender import draw_plane
+from orbitrender import make_caption
+from orbitrender import PlaneCanvas
+
+
+def save_whole(surface, path):
+	'''Saves surface to path as a PNG, so that path only ever holds
+	a complete image.'''
+
+	#pygame picks the format from the extension, so keep .png at the end
+	partPath = join(dirname(path), "partial " + basename(path))
+	pygame.image.save(surface, partPath)
+	replace(partPath, path)
+
+
+class CaptureWriter:
+	'''Hands captured frames to a pool of encoder threads.
+
+	At most queueSize frames wait to be saved at once. If the encoders
+	fall behind, save() waits for a free spot, which keeps memory use
+	bounded. If encoders is 0, frames are saved straight away instead.
+
+	Each frame is written under a temporary name and then renamed, so a
+	screenshot which exists is always complete, even after a crash.'''
+
+	def __init__(self, encoders, queueSize):
+		self.frames = Queue(max(queueSize, 1))
+		self.error = None
+
+		self.encoders = []
+		for e in range(0, encoders):
+			self.encoders.append(Thread(target=self.encode, daemon=True))
+			self.encoders[-1].start()
+
+
+	def save(self, surface, path):
+		'''Queues a copy of surface to be saved to path.'''
+
+		if self.error is not None:
+			raise self.error
+
+		if self.encoders == []:
+			self.write(surface, path)
+		else:
+			self.frames.put((surface.copy(), path))
+
+
+	def encode(self):
+		'''Saves frames from the queue until told to stop.'''
+
+		while True:
+			frame = self.frames.get()
+			if frame is None:
+				self.frames.task_done()
+				return
+
+			try:
+				self.write(frame[0], frame[1])
+			except Exception as error:
+				self.error = error
+
+			self.frames.task_done()
+
+
+	def write(self, surface, path):
+		'''Saves a frame. Called by the encoder threads.'''
+
+		save_whole(surface, path)
+
+
+	def flush(self):
+		'''Waits for every frame queued so far to be saved.'''
+
+		self.frames.join()
+		if self.error is not None:
+			raise self.error
+
+
+	def close(self):
+		'''Waits for every queued frame to be saved.'''
+
+		for encoder in self.encoders:
+			self.frames.put(None)
+
+		for encoder in self.encoders:
+			encoder.join()
+
+		self.encoders = []
+		if self.error is not None:
+			raise self.error
+
+
+class AnimationWriter(CaptureWriter):
+	'''Adds captured frames to the animation file at animationPath,
+	rather than saving them as PNGs. The frames are written in the
+	order they're saved, using at most one encoder thread.'''
+
+	def __init__(self, animationPath, encoders, queueSize):
+		self.animation = AnimationFile(animationPath)
+		CaptureWriter.__init__(self, min(encoders, 1), queueSize)
+
+
+	def write(self, surface, name):
+		'''Adds a frame to the animation file under name.'''
+
+		self.animation.add_frame(pygame.surfarray.array3d(surface), name)
+
+
+	def close(self):
+		'''Waits for every queued frame to be written, then closes the file.'''
+
+		try:
+			CaptureWriter.close(self)
+		finally:
+			self.animation.close()
+
+
+def run_capture(engine, surface, windowed, profiler=None):
+	'''Screenshots every unique plane (or "iterall" screen) of engine,
+	drawing them on surface and saving them in the screenshots directory.
+	If windowed is True, surface is the window, which is updated as
+	screenshots are taken, and closing the window stops the capture.
+
+	Each screenshot is timed as a frame by profiler, if one is given.'''
+
+	if profiler is None:
+		profiler = NoProfiler()
+
+	config = engine.config
+	maxcaptures = config.maxcaptures
+
+	#Checking to see if screenshots directory exists
+	#If not, we'll make it for the user
+	if (config.ANIMATIONPATH == "" or config.CAPTUREJOB != "") and not exists(config.CAPTUREPATH):
+		makedirs(config.CAPTUREPATH)
+
+	if config.CAPTUREJOB != "":
+		if config.CMODE == "iterall":
+			if config.ANIMATIONPATH != "":
+				print("Capture jobs save each screen as a PNG, as screens can be finished out of order.")
+			run_capture_job(engine, surface, windowed, profiler)
+			return
+
+		print("Capture jobs only work with \"iterall\".")
+		print("Taking screenshots in order instead...")
+
+	#First, calculate the cycle length and transient length
+	# so that ORBITVIS can stop taking screenshots once there's
+	# nothing new to see (only if CMODE != "iterall").
+
+	#These parameters aren't needed if we're iterating the entire matrix space
+	if config.CMODE != "iterall":
+		orbitOmega, orbitTau = engine.matrix_orbit_info(engine.F)
+
+		#The +2 is to include one repeated image so the user knows a cycle happened,
+		# as well as the original plane
+		if maxcaptures > orbitTau + orbitOmega + 2 or maxcaptures < 0:
+			maxcaptures = orbitTau + orbitOmega + 2
+
+		#Stop once the vectors are back at their initial states.
+		#Working this out now saves checking the plane after every screenshot.
+		initialFrames = frames_until_initial(engine.F, engine.modulus, orbitOmega, engine.iterations)
+		if initialFrames != -1 and initialFrames < maxcaptures:
+			maxcaptures = initialFrames
+
+	if config.ANIMATIONPATH != "":
+		captureWriter = AnimationWriter(config.ANIMATIONPATH, config.ENCODERS, config.ENCODEQUEUE)
+	else:
+		captureWriter = CaptureWriter(config.ENCODERS, config.ENCODEQUEUE)
+
+	#Only the tiles which changed are redrawn for each screenshot
+	canvas = PlaneCanvas()
+
+	#Loop until there're no more pictures to take
+	while maxcaptures > 0 or maxcaptures == -1:
+		profiler.begin_frame()
+		if engine.iterations != 0:
+			profiler.start("iterate")
+			engine.iterate_plane()
+			profiler.stop("iterate")
+
+		profiler.start("draw")
+		draw_plane(surface, engine, None, canvas)
+		profiler.stop("draw")
+		if windowed:
+			profiler.start("flip")
+			pygame.display.update()
+			profiler.stop("flip")
+			pygame.display.set_caption(make_caption(engine) + profiler.summary())
+
+		profiler.start("save")
+		if config.ANIMATIONPATH != "":
+			captureWriter.save(surface, make_caption(engine))
+		else:
+			captureWriter.save(surface, config.CAPTUREPATH + "/" + make_caption(engine) + ".png")
+		profiler.stop("save")
+		profiler.end_frame()
+
+		engine.iterations += 1
+		if (maxcaptures != -1):
+			maxcaptures -= 1
+
+		#Iterate to next screen
+		if config.CMODE == "iterall" and not engine.next_screen():
+			break
+
+		#Allowing the user to quit whenever
+		if windowed:
+			if any(event.type == pygame.QUIT for event in pygame.event.get()):
+				break
+
+	#Make sure every screenshot has been saved before leaving
+	captureWriter.close()
+
+
+def run_capture_job(engine, surface, windowed, profiler):
+	'''Screenshots "iterall" screens from the capture job in the
+	CAPTUREJOB file, one shard at a time, until none are left. Screens
+	which already have a screenshot are skipped, so a job which was
+	interrupted carries on where it left off.
+
+	A shard is only marked done once all of its screenshots are saved.
+	Closing the window hands the current shard back to the job.'''
+
+	config = engine.config
+	job = CaptureJob(config.CAPTUREJOB, capture_manifest(config), config.SHARDSIZE, config.JOBLEASE)
+	captureWriter = CaptureWriter(config.ENCODERS, config.ENCODEQUEUE)
+
+	quitting = False
+	while not quitting:
+		claimed = job.claim()
+		if claimed is None:
+			break
+
+		shard, start, stop = claimed
+		for index in range(start, stop):
+			engine.seek_screen(index)
+			path = config.CAPTUREPATH + "/" + make_caption(engine) + ".png"
+			if exists(path):
+				continue
+
+			profiler.begin_frame()
+			profiler.start("iterate")
+			engine.iterate_plane()
+			profiler.stop("iterate")
+
+			profiler.start("draw")
+			draw_plane(surface, engine)
+			profiler.stop("draw")
+			if windowed:
+				profiler.start("flip")
+				pygame.display.update()
+				profiler.stop("flip")
+				pygame.display.set_caption(make_caption(engine) + profiler.summary())
+
+			profiler.start("save")
+			captureWriter.save(surface, path)
+			profiler.stop("save")
+			profiler.end_frame()
+
+			job.check_in(shard)
+
+			#Allowing the user to quit whenever
+			if windowed:
+				if any(event.type == pygame.QUIT for event in pygame.event.get()):
+					quitting = True
+					break
+
+		if quitting:
+			job.release(shard)
+		else:
+			captureWriter.flush()
+			job.finish(shard)
+
+			pending, working, done = job.progress()
+			print("Shard", shard, "done (" + str(done), "of", pending + working + done, "shards)")
+
+	#Make sure every screenshot has been saved before leaving
+	captureWriter.close()
+	job.close()
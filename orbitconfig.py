@@ -0,0 +1,302 @@
+'''
+Reads ORBITVIS' .config file (see "documentation/.config specs.txt")
+and update matrix, without needing pygame or a window.
+
+October 18, 2026
+'''
+
+'''
+The following resources were used as a reference:
+https://docs.python.org/3.8/tutorial/inputoutput.html
+https://docs.python.org/3.8/library/stdtypes.html?highlight=comparing%20strings#string-methods
+'''
+
+from ctypes import *
+
+from orbitkernels import BACKENDcatalogue
+from orbitkernels import EXCEPTIONunknownBACKEND
+
+CMODEcatalogue = ["iterplane", "iterstate", "iterall", "cycles"]
+EXCEPTIONunknownCMODE = "Unknown CMODE passed in config file."
+
+REDUCTIONcatalogue = ["last", "mean", "max"]
+EXCEPTIONunknownREDUCTION = "Unknown reduction passed in config file."
+
+
+class Config:
+	'''Holds the settings from a .config file. Anything the file
+	doesn't mention keeps the default given here.'''
+
+	def __init__(self):
+		self.windowDimensions = [640, 480]
+
+		# "iterplane" : Use .so files to generate iterations on the fly
+		# "iterstate" : Same as "iterplane", except current vector states are saved in vectorStates,
+		#    reducing the C computation needed. (potentially faster for large moduli,
+		#    though requires more memory).
+		# "cycles"    : Colours vectors based on their cycle length. Brighter = higher cycle length
+		# "iterall"   : Iterates every possible matrix under the given modulus and displays
+		#    coloured squares based on the transient and cycle lengths of each matrix.
+		self.CMODE = "iterstate"
+
+		#repaint  : Colour based on where its initial vector lands on that iteration
+		#drag     : Colour based on which vector goes to that spot
+		#relative : Colour iterall tiles based on the relative cycle and translent lengths of others on the same screen
+		#rellog   : Same as above, but with a logarithmic curve added to the colouring
+		self.COLORMODE = "drag"
+
+		#mixed : Matrices are coloured based on cycle lengths and transient lengths
+		#solo  : Matrices are coloured based only on transient lengths
+		#none  : Matrices are coloured based only on cycle lengths
+		self.COLORTRANSIENT = "mixed"
+
+		#How a pixel is coloured when it covers more than one tile (see orbitrender.py)
+		#last : The tile drawn last, as when the tiles are drawn one by one
+		#mean : The average colour of the tiles
+		#max  : The tile with the most red, which is the largest omega for "cycles" and "iterall"
+		self.REDUCTION = "last"
+
+		#diag    : For iterall, arrow keys increment the diagonal entries
+		#nondiag : For iterall, arrow keys increment nondiagonal entries
+		self.ARRANGEMENT = "diag"
+
+		#Says whether we can click on vectors to obtain information about them
+		#Also activates hovering over vectors with the mouse
+		self.HOVERMODE = False
+
+		#When this is true, the program will generate all unique planes for
+		# the given system and screenshot them, putting them in the specified folder
+		#maxcaptures controls how many screenshots to take before stopping.
+		#If not set in the .config file, ORBITVIS will continue to take screenshots
+		# until it reaches the vectors' initial state again
+		self.CAPTUREMODE = False
+		self.maxcaptures = -1
+
+		#When this is true (and CAPTUREMODE is on), screenshots are drawn
+		# off-screen and saved without ever opening a window
+		self.HEADLESS = False
+
+		#How many threads save screenshots in the background while the next
+		# plane is computed (0 saves them in the main loop), and how many
+		# screenshots can be waiting to be saved at once
+		self.ENCODERS = 1
+		self.ENCODEQUEUE = 8
+
+		#Where to save every CAPTUREMODE frame as one animation file
+		# (see orbitanimation.py). If left empty, each frame is saved
+		# as a PNG in CAPTUREPATH.
+		self.ANIMATIONPATH = ""
+
+		#Where to keep the shards of an "iterall" capture, so it can be resumed
+		# and shared between processes (see orbitjobs.py). If left empty,
+		# screenshots are taken in order by this process alone.
+		#SHARDSIZE is how many screens are in a shard, and JOBLEASE is how
+		# many seconds a shard's owner can go without checking in before
+		# the shard is handed to someone else
+		self.CAPTUREJOB = ""
+		self.SHARDSIZE = 64
+		self.JOBLEASE = 600
+
+		#How many processes to split "iterall" screens across.
+		#1 computes every screen in this process.
+		self.WORKERS = 1
+
+		#Where to keep the cycle and transient lengths of matrices between runs.
+		#If left empty, nothing is cached.
+		#CACHESIZE is the most matrices the cache will hold (-1 for no limit)
+		self.CACHEPATH = ""
+		self.CACHESIZE = 1000000
+
+		#How many "iterall" screens to keep in memory (0 keeps none)
+		#When PREFETCH is true, the screens next to the current one are
+		# worked out in the background while the window is idle
+		self.SCREENCACHE = 16
+		self.PREFETCH = False
+
+		#Directory holding precomputed orbit atlases (see orbitatlas.py).
+		#If left empty, no atlases are used.
+		self.ATLASPATH = ""
+
+		self.MODULUS = 0
+		self.iterations = 0
+		self.MATRIXPATH = ""
+
+		self.OBJECTPATH = ""
+
+		#"c"     : Use LINCELLAUT's orbitvis.so for orbit computations
+		#"numpy" : Use NumPy instead, so orbitvis.so isn't needed
+		self.BACKEND = "c"
+		self.CAPTUREPATH = ""
+
+		#When this is true, each frame's phases are timed and the averages
+		# are shown in the caption (see orbitprofile.py)
+		#Frames PROFILEFRAMES[0] to PROFILEFRAMES[1] are run under cProfile,
+		# and the results saved to PROFILEPATH (if it isn't empty)
+		self.PROFILE = False
+		self.PROFILEPATH = ""
+		self.PROFILEFRAMES = [1, 1]
+
+
+def read_config(path):
+	'''Reads the .config file at path, returning a Config.
+
+	Colouring modes which don't work with the chosen CMODE, and
+	headless mode without CAPTUREMODE, fall back to what works.'''
+
+	config = Config()
+
+	#Should be error checking here, but oh well
+	configData = open(path, "r")
+	for line in configData:
+		splitline = line.split(" ")
+
+		if len(splitline) == 2:
+			splitline[1] = splitline[1].rstrip()
+		else:
+			splitline[0] = splitline[0].rstrip()
+
+		if splitline[0] == "mod":
+			config.MODULUS = int(splitline[1])
+
+		elif splitline[0] == "cmode":
+			config.CMODE = splitline[1]
+
+			#Finally, some bloody error checking
+			if config.CMODE not in CMODEcatalogue:
+				raise Exception(EXCEPTIONunknownCMODE)
+
+		elif splitline[0] == "colormode":
+			config.COLORMODE = splitline[1]
+
+		elif splitline[0] == "reduction":
+			config.REDUCTION = splitline[1]
+
+			if config.REDUCTION not in REDUCTIONcatalogue:
+				raise Exception(EXCEPTIONunknownREDUCTION)
+
+		elif splitline[0] == "arrangement":
+			config.ARRANGEMENT = splitline[1]
+
+		elif splitline[0] == "colortransient":
+			config.COLORTRANSIENT = splitline[1]
+
+		elif splitline[0] == "update":
+			config.MATRIXPATH = splitline[1]
+
+		elif splitline[0] == "objects":
+			config.OBJECTPATH = splitline[1]
+
+		elif splitline[0] == "backend":
+			config.BACKEND = splitline[1]
+
+			if config.BACKEND not in BACKENDcatalogue:
+				raise Exception(EXCEPTIONunknownBACKEND)
+
+		elif splitline[0] == "hover":
+			config.HOVERMODE = True
+
+		elif splitline[0] == "capture":
+			config.CAPTUREMODE = True
+
+		elif splitline[0] == "headless":
+			config.HEADLESS = True
+
+		elif splitline[0] == "encoders":
+			config.ENCODERS = int(splitline[1])
+
+		elif splitline[0] == "encodequeue":
+			config.ENCODEQUEUE = int(splitline[1])
+
+		elif splitline[0] == "screenshots":
+			config.CAPTUREPATH = splitline[1]
+
+		elif splitline[0] == "animation":
+			config.ANIMATIONPATH = splitline[1]
+
+		elif splitline[0] == "capturejob":
+			config.CAPTUREJOB = splitline[1]
+
+		elif splitline[0] == "shardsize":
+			config.SHARDSIZE = int(splitline[1])
+
+		elif splitline[0] == "joblease":
+			config.JOBLEASE = float(splitline[1])
+
+		elif splitline[0] == "maxcaptures":
+			config.maxcaptures = int(splitline[1])
+
+		elif splitline[0] == "inititer":
+			config.iterations = int(splitline[1])
+
+		elif splitline[0] == "workers":
+			config.WORKERS = int(splitline[1])
+
+		elif splitline[0] == "cache":
+			config.CACHEPATH = splitline[1]
+
+		elif splitline[0] == "cachesize":
+			config.CACHESIZE = int(splitline[1])
+
+		elif splitline[0] == "screencache":
+			config.SCREENCACHE = int(splitline[1])
+
+		elif splitline[0] == "prefetch":
+			config.PREFETCH = True
+
+		elif splitline[0] == "atlas":
+			config.ATLASPATH = splitline[1]
+
+		elif splitline[0] == "profile":
+			config.PROFILE = True
+
+		elif splitline[0] == "profiledump":
+			config.PROFILE = True
+			config.PROFILEPATH = splitline[1]
+
+		elif splitline[0] == "profileframes":
+			config.PROFILEFRAMES = [int(frame) for frame in splitline[1].split("-")]
+			if len(config.PROFILEFRAMES) == 1:
+				config.PROFILEFRAMES.append(config.PROFILEFRAMES[0])
+
+		elif splitline[0] == "sizeX":
+			config.windowDimensions[0] = int(splitline[1])
+
+		elif splitline[0] == "sizeY":
+			config.windowDimensions[1] = int(splitline[1])
+
+	configData.close()
+
+	#Making sure we're using compatiable colouring modes
+	if config.CMODE in ["iterstate", "iterplane"] and config.COLORMODE not in ["repaint", "drag"]:
+		print("Selected COLORMODE isn't compatiable with chosen CMODE.")
+		print("Defaulting COLORMODE to drag...")
+		config.COLORMODE = "drag"
+
+	elif config.CMODE in ["iterall", "cycles"] and config.COLORMODE not in ["relative", "rellog"]:
+		print("Selected COLORMODE isn't compatiable with chosen CMODE.")
+		print("Defaulting COLORMODE to rellog...")
+		config.COLORMODE = "rellog"
+
+	if config.HEADLESS and (not config.CAPTUREMODE or config.CMODE == "cycles"):
+		print("Headless mode only works with CAPTUREMODE.")
+		print("Opening a window instead...")
+		config.HEADLESS = False
+
+	return config
+
+
+def read_matrix(path):
+	'''Reads the update matrix from the file at path, returning
+	its rows. Raises OSError if the file can't be opened.'''
+
+	matrixData = open(path)
+
+	matrixData.readline()
+	data = matrixData.readline()
+	row1 = (c_int*2)(int(data.split(" ")[0]), int(data.split(" ")[1]))
+	data = matrixData.readline()
+	row2 = (c_int*2)(int(data.split(" ")[0]), int(data.split(" ")[1]))
+
+	matrixData.close()
+
+	return row1, row2
@@ -0,0 +1,464 @@
+'''
+The ORBITVIS engine: holds the vector plane (or "iterall" screen)
+for a Config and steps it, without needing pygame. orbitvis.py is
+a front end to this, and batch jobs can drive it directly:
+
+engine = Engine(read_config("config/system.config"))
+engine.step()
+states = engine.export_state()["states"]
+
+October 18, 2026
+'''
+
+'''
+The following resources were used as a reference:
+https://docs.python.org/3.8/library/ctypes.html?highlight=ctypes#module-ctypes
+https://numpy.org/doc/stable/reference/generated/numpy.savez_compressed.html
+'''
+
+from ctypes import *
+
+import numpy as np
+
+from orbitatlas import load_atlases
+from orbitcache import OrbitCache
+from orbitcache import ScreenCache
+from orbitconfig import read_matrix
+from orbitfactor import FactoredOrbits
+from orbitkernels import make_backend
+from orbitkernels import screen_maxima
+from orbitmath import identity_plane
+from orbitmath import matrix_power
+from orbitmath import step_plane
+from orbitmath import STATETYPE
+from orbitworkers import make_pool
+
+
+def set_matrix(theMatrix, matrixArr):
+	'''Sets the values for our update matrix, used with "iterall".'''
+
+	for x in range(0, len(matrixArr)):
+		for y in range(0, len(matrixArr[0])):
+			theMatrix[x][y] = matrixArr[x][y]
+
+
+def copy_matrix(theMatrix):
+	'''Returns a copy of a 2x2 ctypes matrix.'''
+
+	matrixCopy = ((c_int * 2) * 2)()
+	set_matrix(matrixCopy, theMatrix)
+	return matrixCopy
+
+
+def shift_screen(theMatrix, across, up, modulus, arrangement):
+	'''Changes the entries of theMatrix which pick out its "iterall"
+	screen, moving across and up by the given number of screens
+	and wrapping around at the edges.'''
+
+	if arrangement == "nondiag":
+		theMatrix[0][1] = (theMatrix[0][1] + across) % modulus
+		theMatrix[1][0] = (theMatrix[1][0] + up) % modulus
+
+	elif arrangement == "diag":
+		theMatrix[1][1] = (theMatrix[1][1] + across) % modulus
+		theMatrix[0][0] = (theMatrix[0][0] + up) % modulus
+
+
+class Engine:
+	'''Computes ORBITVIS planes for the settings in config.
+
+	F is the update matrix, and iterations counts how many times the
+	plane has been iterated. For "iterall", F's entries which don't vary
+	across the screen pick out which screen is shown, and maxInfo holds
+	the screen's largest omega and tau.
+
+	If deferPlane is True, "cycles" planes and "iterall" screens which
+	aren't cached are left blank instead of being computed, and
+	pendingPlane is set, so that a front end can work them out in the
+	background (see plane_progress()).
+
+	If backend is given, it's used instead of loading the one config
+	asks for.
+
+	Reading the update matrix raises OSError if its file can't be opened.'''
+
+	def __init__(self, config, deferPlane=False, backend=None):
+		self.config = config
+		self.modulus = config.MODULUS
+		self.iterations = config.iterations
+
+		#Holds the place in their orbit where each vector is at
+		#This prevents us from having to retraverse each orbit each time
+		# we want to iterate
+		self.vectorStates = None
+
+		#For iterall mode, this holds the max omega and max tau value for each plane
+		#This helps us normalise the colour values
+		self.maxInfo = [0, 0]
+
+		#Whether the plane was left blank for the front end to work out
+		self.deferPlane = deferPlane
+		self.pendingPlane = False
+
+		#vectorStates as of the last call to moved_vectors()
+		self.reportedStates = None
+
+		#Load C libraries (or the NumPy backend)
+		if backend is None:
+			backend = make_backend(config.BACKEND, config.OBJECTPATH)
+		self.backend = backend
+
+		#Worker processes for computing "iterall" screens, if asked for.
+		#poolUnavailable is True if they were asked for but can't be used
+		# on this platform, in which case screens are computed in this process.
+		self.screenPool = None
+		self.poolUnavailable = False
+		if config.CMODE == "iterall" and config.WORKERS > 1:
+			self.screenPool = make_pool(config.BACKEND, config.OBJECTPATH, config.WORKERS)
+			self.poolUnavailable = self.screenPool is None
+
+		#Works out orbit info one prime power of MODULUS at a time,
+		# reading from the atlases where there are any
+		self.orbitFactors = FactoredOrbits(self.backend, self.screenPool, config.WORKERS,
+		                                   load_atlases(config.ATLASPATH, self.modulus))
+
+		#Cache of matrix cycle and transient lengths, if asked for
+		self.orbitCache = None
+		if config.CACHEPATH != "":
+			self.orbitCache = OrbitCache(config.CACHEPATH, config.CACHESIZE)
+
+		#The latest "iterall" screens, kept in memory
+		self.screenCache = None
+		if config.CMODE == "iterall" and config.SCREENCACHE > 0:
+			self.screenCache = ScreenCache(config.SCREENCACHE)
+
+		if config.CMODE != "iterall":
+			row1, row2 = read_matrix(config.MATRIXPATH)
+		else:
+			row1 = (c_int*2)(0, 0)
+			row2 = (c_int*2)(0, 0)
+
+		#This is our update matrix
+		self.F = ((c_int * 2) * 2)(row1, row2)
+
+		#When using iterplane, this array keeps track of what our
+		# matrix has iterated to.
+		self.currentF = ((c_int * 2) * 2)(row1, row2)
+
+		#Initialise state of each vector before drawing, if needed
+		if config.CMODE in ["iterstate", "iterplane"]:
+			#This allows the starting iteration to be nonzero
+			self.seek_iteration(self.iterations)
+
+		#Other CMODEs look the same on every iteration
+		elif config.CMODE in ["iterall", "cycles"]:
+			self.vectorStates = np.zeros((self.modulus, self.modulus, 2), dtype=STATETYPE)
+			self.iterate_plane()
+
+
+	def matrix_orbit_info(self, theMatrix):
+		'''Returns [omega, tau] for theMatrix, checking the
+		orbit cache first (if there is one).'''
+
+		if self.orbitCache is not None:
+			matrixInfo = self.orbitCache.lookup(theMatrix, self.modulus)
+			if matrixInfo is not None:
+				return matrixInfo
+
+		matrixInfo = self.orbitFactors.matrix_info(theMatrix, self.modulus)
+
+		if self.orbitCache is not None:
+			self.orbitCache.store(theMatrix, self.modulus, matrixInfo[0], matrixInfo[1])
+
+		return matrixInfo
+
+
+	def iterate_plane(self):
+		'''Iterates each vector in the plane, stores their state
+		in vectorStates (if needed).
+
+		For CMODE "iterstate", the whole plane is stepped at once
+		using NumPy instead of calling C_step on each vector.
+
+		For CMODE "cycles", the cycle lengths of every vector are
+		found together, so no orbit is traversed more than once.
+
+		For CMODE "iterall", vectorStates holds the results of all
+		currently seen matrices after using Floyd's Cycle Detection
+		Algorithm. The max values are found once the whole screen
+		has been computed.
+
+		"cycles" and "iterall" are worked out mod each prime power
+		dividing MODULUS and then combined (see orbitfactor.py).
+		If the engine defers its planes, they're blanked instead.'''
+
+		CMODE = self.config.CMODE
+		ARRANGEMENT = self.config.ARRANGEMENT
+
+		if CMODE == "iterstate":
+			self.vectorStates = step_plane(self.vectorStates, self.F, self.modulus)
+
+		elif CMODE == "iterplane":
+			self.backend.C_iterate_matrix(self.F, self.currentF, self.modulus)
+
+		elif CMODE in ["cycles", "iterall"]:
+			screenInfo = self.cached_screen()
+			if screenInfo is not None:
+				self.show_screen(screenInfo)
+
+			elif self.deferPlane:
+				self.vectorStates[...] = 0
+				self.maxInfo[:] = [0, 0]
+				self.pendingPlane = True
+
+			elif CMODE == "cycles":
+				self.show_screen(self.orbitFactors.cycle_lengths(self.F, self.modulus))
+
+			else:
+				self.show_screen(self.orbitFactors.screen(self.F, self.modulus, ARRANGEMENT), True)
+
+
+	def cached_screen(self):
+		'''Returns the current "iterall" screen from the screen cache or
+		the orbit cache, or None if it isn't in either.'''
+
+		ARRANGEMENT = self.config.ARRANGEMENT
+
+		if self.config.CMODE != "iterall":
+			return None
+
+		if self.screenCache is not None:
+			screenInfo = self.screenCache.lookup(self.F, self.modulus, ARRANGEMENT)
+			if screenInfo is not None:
+				return screenInfo
+
+		if self.orbitCache is None:
+			return None
+
+		screenInfo = self.orbitCache.lookup_screen(self.F, self.modulus, ARRANGEMENT)
+		if screenInfo is not None and self.screenCache is not None:
+			self.screenCache.store(self.F, self.modulus, ARRANGEMENT, screenInfo)
+
+		return screenInfo
+
+
+	def plane_progress(self, F):
+		'''Works out the "cycles" plane or "iterall" screen for the
+		update matrix F, yielding it each time more of it is finished
+		(see FactoredOrbits.screen_progress()). Nothing in the engine
+		is changed, so this can run in another thread while the engine
+		is used. F's entries may be changed, so pass in a copy.
+
+		The orbit cache isn't read or written here, since it can only
+		be used from the thread that opened it.'''
+
+		if self.config.CMODE == "cycles":
+			yield self.orbitFactors.cycle_lengths(F, self.modulus)
+
+		elif self.config.CMODE == "iterall":
+			yield from self.orbitFactors.screen_progress(F, self.modulus, self.config.ARRANGEMENT)
+
+
+	def show_screen(self, screenInfo, store=False):
+		'''Makes screenInfo the plane that's shown. For "cycles", this is
+		each vector's cycle length. For "iterall", it's [omega, tau] for each
+		tile on the current screen, which is saved to the screen and orbit
+		caches (if there are any) when store is True.'''
+
+		if self.config.CMODE == "cycles":
+			self.vectorStates[..., 0] = screenInfo
+			self.vectorStates[..., 1] = -1
+
+		elif self.config.CMODE == "iterall":
+			if store and self.screenCache is not None:
+				self.screenCache.store(self.F, self.modulus, self.config.ARRANGEMENT, screenInfo)
+
+			if store and self.orbitCache is not None:
+				self.orbitCache.store_screen(self.F, self.modulus, self.config.ARRANGEMENT, screenInfo)
+
+			self.vectorStates = screenInfo.astype(STATETYPE)
+
+			#Now, update maxInfo so we can normalise colours
+			self.maxInfo[:] = screen_maxima(self.vectorStates)
+
+
+	def step(self):
+		'''Moves on by one iteration. For "iterall", this moves to the
+		next screen along instead (see move_screen()). "cycles" looks
+		the same on every iteration, so nothing changes.'''
+
+		if self.config.CMODE == "cycles":
+			return
+
+		self.iterations += 1
+		if self.config.CMODE == "iterall":
+			self.move_screen(1, 0)
+		else:
+			self.iterate_plane()
+
+
+	def seek_iteration(self, iteration):
+		'''Jumps straight to the given iteration in "iterstate" and "iterplane".
+		F^iteration is found by repeated squaring, so this takes O(log(iteration))
+		matrix products instead of iteration calls to iterate_plane().'''
+
+		self.iterations = iteration
+		FPower = matrix_power(self.F, iteration, self.modulus)
+
+		if self.config.CMODE == "iterstate":
+			self.vectorStates = step_plane(identity_plane(self.modulus), FPower, self.modulus)
+
+		elif self.config.CMODE == "iterplane":
+			set_matrix(self.currentF, FPower)
+
+
+	def reset(self):
+		'''Goes back to the 0th iteration in "iterstate" and "iterplane".'''
+
+		if self.config.CMODE in ["iterstate", "iterplane"]:
+			self.seek_iteration(0)
+
+
+	def move_screen(self, across, up):
+		'''Moves an "iterall" screen across and up by the given number of
+		screens, wrapping around at the edges, and computes the new screen.'''
+
+		shift_screen(self.F, across, up, self.modulus, self.config.ARRANGEMENT)
+		self.iterate_plane()
+
+
+	def neighbour_screens(self):
+		'''Returns copies of F for the "iterall" screens which the arrow
+		keys move to from the current one, leaving out any which are
+		already in the screen cache.'''
+
+		neighbours = []
+		for across, up in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
+			neighbourF = copy_matrix(self.F)
+			shift_screen(neighbourF, across, up, self.modulus, self.config.ARRANGEMENT)
+
+			if not self.screenCache.contains(neighbourF, self.modulus, self.config.ARRANGEMENT):
+				neighbours.append(neighbourF)
+
+		return neighbours
+
+
+	def next_screen(self):
+		'''Moves F on to the next "iterall" screen in reading order, without
+		computing it. Returns False once every screen has been seen.'''
+
+		if self.config.ARRANGEMENT == "nondiag":
+			self.F[0][1] += 1
+			if self.F[0][1] >= self.modulus:
+				self.F[0][1] -= self.modulus
+				self.F[1][0] += 1
+				if self.F[1][0] >= self.modulus:
+					return False
+
+		elif self.config.ARRANGEMENT == "diag":
+			self.F[1][1] += 1
+			if self.F[1][1] >= self.modulus:
+				self.F[1][1] -= self.modulus
+				self.F[0][0] += 1
+				if self.F[0][0] >= self.modulus:
+					return False
+
+		return True
+
+
+	def seek_screen(self, index):
+		'''Moves F straight to the given "iterall" screen, counting from 0
+		in the order next_screen() takes them, without computing it.'''
+
+		if self.config.ARRANGEMENT == "nondiag":
+			self.F[0][1] = index % self.modulus
+			self.F[1][0] = index // self.modulus
+
+		elif self.config.ARRANGEMENT == "diag":
+			self.F[1][1] = index % self.modulus
+			self.F[0][0] = index // self.modulus
+
+
+	def moved_vectors(self):
+		'''Returns which vectors have moved since this was last called, as a
+		boolean array of shape (modulus, modulus), along with vectorStates as
+		it was then. Only "iterstate" keeps track of this; otherwise, and
+		on the first call, None, None is returned.'''
+
+		if self.config.CMODE != "iterstate":
+			return None, None
+
+		#vectorStates is always replaced rather than changed in place
+		previous = self.reportedStates
+		self.reportedStates = self.vectorStates
+		if previous is None:
+			return None, None
+
+		moved = (previous != self.vectorStates).any(axis=-1)
+		return moved, previous
+
+
+	def is_initial_state(self):
+		'''This function checks to see whether our vectors are back at their
+		initial states. Returns True is they are, False otherwise.'''
+
+		if self.config.CMODE in ["iterstate", "iterplane"]:
+			return bool((self.plane_states() == identity_plane(self.modulus)).all())
+
+		return True
+
+
+	def plane_states(self):
+		'''Returns the array the plane is drawn from. For "iterstate"
+		and "iterplane", [x][y] holds where <x, y> is now. For "cycles"
+		and "iterall", [x][y] holds [omega, tau] (tau is -1 for "cycles").'''
+
+		if self.config.CMODE == "iterplane":
+			return step_plane(identity_plane(self.modulus), self.currentF, self.modulus)
+
+		return self.vectorStates
+
+
+	def export_state(self):
+		'''Returns copies of the engine's current state as arrays.'''
+
+		return {"states" : np.array(self.plane_states()),
+		        "F" : np.array([[self.F[0][0], self.F[0][1]], [self.F[1][0], self.F[1][1]]]),
+		        "modulus" : np.array(self.modulus),
+		        "iterations" : np.array(self.iterations),
+		        "maxInfo" : np.array(self.maxInfo)}
+
+
+	def save_state(self, path):
+		'''Saves the arrays from export_state() to a .npz file at path.'''
+
+		np.savez_compressed(path, **self.export_state())
+
+
+	def cache_stats(self):
+		'''Returns how many lookups found what they were after (hits) and
+		how many didn't (misses) in each cache in use, as a dictionary of
+		[hits, misses] keyed by "screen" and "orbit". The screen cache's
+		entry also has the fraction of lookups which were hits.'''
+
+		stats = {}
+		if self.screenCache is not None:
+			stats["screen"] = [self.screenCache.hits, self.screenCache.misses, self.screenCache.hit_rate()]
+		if self.orbitCache is not None:
+			stats["orbit"] = [self.orbitCache.hits, self.orbitCache.misses]
+
+		return stats
+
+
+	def close(self):
+		'''Shuts down the worker processes and closes the orbit cache.'''
+
+		if self.screenPool is not None:
+			self.screenPool.terminate()
+			self.screenPool = None
+
+		self.screenCache = None
+
+		if self.orbitCache is not None:
+			self.orbitCache.close()
+			self.orbitCache = None
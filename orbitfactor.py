@@ -0,0 +1,230 @@
+'''
+Finds cycle and transient lengths mod MODULUS by working
+mod each prime power dividing MODULUS instead. By the Chinese
+remainder theorem, an orbit mod MODULUS repeats exactly when
+it repeats mod every prime power, so the cycle lengths combine
+with lcm and the transient lengths with max.
+
+October 18, 2026
+'''
+
+'''
+The following resources were used as a reference:
+https://en.wikipedia.org/wiki/Chinese_remainder_theorem
+https://numpy.org/doc/stable/reference/generated/numpy.lcm.html
+https://docs.python.org/3.8/library/collections.html#collections.OrderedDict
+'''
+
+from collections import OrderedDict
+from math import gcd
+from threading import Lock
+
+from ctypes import *
+
+import numpy as np
+
+from orbitatlas import atlas_matrix_info
+from orbitatlas import atlas_screen
+from orbitkernels import set_screen_matrix
+from orbitmath import plane_cycle_lengths
+from orbitmath import prime_power_factors
+from orbitworkers import screen_row_chunks
+
+#How many numbers the remembered prime power results may hold in total
+MEMOCELLS = 2**24
+
+
+def reduce_matrix(F, modulus):
+	'''Returns a copy of F with its entries taken mod modulus.'''
+
+	return ((c_int * 2) * 2)((c_int * 2)(F[0][0] % modulus, F[0][1] % modulus),
+	                         (c_int * 2)(F[1][0] % modulus, F[1][1] % modulus))
+
+
+def matrix_key(F):
+	'''Returns the entries of F as a tuple, for remembering results.'''
+
+	return (F[0][0], F[0][1], F[1][0], F[1][1])
+
+
+class FactoredOrbits:
+	'''Computes orbit info for "cycles" and "iterall" one prime power at
+	a time, using backend for the prime power results (and pool's
+	workers for "iterall" screens, if pool isn't None).
+
+	Prime power results are remembered, least recently used first out,
+	since the same ones come up again as F changes.
+
+	atlases maps prime powers to their atlases (see orbitatlas.py).
+	Results for these prime powers are read from the atlas instead.
+
+	The remembered results can be shared between threads.'''
+
+	def __init__(self, backend, pool=None, workers=1, atlases=None, memoCells=MEMOCELLS):
+		self.backend = backend
+		self.pool = pool
+		self.workers = workers
+		self.atlases = atlases if atlases is not None else {}
+
+		self.memo = OrderedDict()
+		self.memoLock = Lock()
+		self.memoCells = memoCells
+		self.cells = 0
+
+
+	def remember(self, key, compute):
+		'''Returns the result stored under key, or computes,
+		stores and returns it if there isn't one.'''
+
+		with self.memoLock:
+			if key in self.memo:
+				self.memo.move_to_end(key)
+				return self.memo[key]
+
+		result = compute()
+
+		with self.memoLock:
+			if key not in self.memo:
+				self.memo[key] = result
+				self.cells += np.size(result)
+
+			while self.cells > self.memoCells and len(self.memo) > 1:
+				self.cells -= np.size(self.memo.popitem(last=False)[1])
+
+		return result
+
+
+	def matrix_info(self, F, modulus):
+		'''Returns [omega, tau] for the sequence F, F^2, F^3, ...'''
+
+		omega = 1
+		tau = 0
+		for primePower in prime_power_factors(modulus):
+			reducedF = reduce_matrix(F, primePower)
+
+			if primePower in self.atlases:
+				primeOmega, primeTau = atlas_matrix_info(self.atlases[primePower], reducedF)
+
+			#The two is from rows(F)
+			else:
+				primeOmega, primeTau = self.remember(("matrix", primePower, matrix_key(reducedF)),
+					lambda: divmod(self.backend.get_orbit_info_array(reducedF, primePower), 2*primePower))
+
+			omega = omega*primeOmega//gcd(omega, primeOmega)
+			tau = max(tau, primeTau)
+
+		return [omega, tau]
+
+
+	def cycle_lengths(self, F, modulus):
+		'''Returns the cycle length of every vector's orbit under F,
+		as an array of shape (modulus, modulus).'''
+
+		vects = np.arange(modulus)
+		cycleLengths = np.ones((modulus, modulus), dtype=np.int64)
+
+		for primePower in prime_power_factors(modulus):
+			reducedF = reduce_matrix(F, primePower)
+			primeLengths = self.remember(("cycles", primePower, matrix_key(reducedF)),
+				lambda: plane_cycle_lengths(reducedF, primePower))
+
+			reduced = vects % primePower
+			cycleLengths = np.lcm(cycleLengths, primeLengths[np.ix_(reduced, reduced)])
+
+		return cycleLengths
+
+
+	def prime_screen_rows(self, F, modulus, arrangement):
+		'''Computes an "iterall" screen for a single prime power, yielding
+		(xStart, rows) for each chunk of rows as it finishes.'''
+
+		if modulus in self.atlases:
+			yield 0, atlas_screen(self.atlases[modulus], F, arrangement)
+
+		elif self.pool is not None:
+			yield from screen_row_chunks(self.pool, self.workers, F, modulus, arrangement)
+
+		else:
+			rowsPerChunk = max(1, self.backend.chunkTiles//modulus)
+			for xStart in range(0, modulus, rowsPerChunk):
+				xStop = min(xStart + rowsPerChunk, modulus)
+				yield xStart, self.backend.orbit_info_rows(F, modulus, arrangement, xStart, xStop)
+
+
+	def prime_screen(self, F, modulus, arrangement):
+		'''Computes an "iterall" screen for a single prime power.'''
+
+		primeInfo = np.zeros((modulus, modulus, 2), dtype=np.int64)
+		for xStart, rows in self.prime_screen_rows(F, modulus, arrangement):
+			primeInfo[xStart:xStart + len(rows)] = rows
+
+		return primeInfo
+
+
+	def screen(self, F, modulus, arrangement):
+		'''Same as orbit_info_screen, but worked out one prime power
+		at a time. The entries of F which vary across the screen are
+		left as they would be after the last tile.'''
+
+		for screenInfo in self.screen_progress(F, modulus, arrangement):
+			pass
+
+		return screenInfo
+
+
+	def screen_progress(self, F, modulus, arrangement):
+		'''Same as screen(), but yields the screen each time more of it
+		is finished. Tiles which aren't finished yet have omega and tau
+		set to 0. The last thing yielded is the whole screen.
+
+		The smaller prime powers are worked out first. If the largest
+		prime power's screen isn't already known, it's worked out a few
+		rows at a time, and each chunk finishes every row of the full
+		screen which reduces to one of its rows.'''
+
+		tiles = np.arange(modulus)
+		combined = np.zeros((modulus, modulus, 2), dtype=np.int64)
+		combined[..., 0] = 1
+
+		factors = sorted(prime_power_factors(modulus))
+		for primePower in factors:
+			reducedF = reduce_matrix(F, primePower)
+
+			#Only the entries which don't vary across the screen pick it out
+			set_screen_matrix(reducedF, 0, 0, arrangement)
+			key = ("screen", primePower, arrangement, matrix_key(reducedF))
+
+			if primePower in self.atlases:
+				primeInfo = self.prime_screen(reducedF, primePower, arrangement)
+			elif primePower == factors[-1] and key not in self.memo:
+				break
+			else:
+				primeInfo = self.remember(key, lambda: self.prime_screen(reducedF, primePower, arrangement))
+
+			reduced = tiles % primePower
+			primeInfo = primeInfo[np.ix_(reduced, reduced)]
+			combined[..., 0] = np.lcm(combined[..., 0], primeInfo[..., 0])
+			combined[..., 1] = np.maximum(combined[..., 1], primeInfo[..., 1])
+
+		#Every prime power was already known
+		else:
+			set_screen_matrix(F, modulus - 1, modulus - 1, arrangement)
+			yield combined
+			return
+
+		screenInfo = np.zeros((modulus, modulus, 2), dtype=np.int64)
+		primeInfo = np.zeros((primePower, primePower, 2), dtype=np.int64)
+		reduced = tiles % primePower
+
+		for xStart, rows in self.prime_screen_rows(reducedF, primePower, arrangement):
+			primeInfo[xStart:xStart + len(rows)] = rows
+
+			finished = tiles[(reduced >= xStart) & (reduced < xStart + len(rows))]
+			rows = primeInfo[np.ix_(reduced[finished], reduced)]
+			screenInfo[finished, :, 0] = np.lcm(combined[finished, :, 0], rows[..., 0])
+			screenInfo[finished, :, 1] = np.maximum(combined[finished, :, 1], rows[..., 1])
+
+			yield screenInfo
+
+		self.remember(key, lambda: primeInfo)
+		set_screen_matrix(F, modulus - 1, modulus - 1, arrangement)
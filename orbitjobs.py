@@ -0,0 +1,196 @@
+'''
+Splits "iterall" captures into shards of screens, kept in an
+SQLite job file, so that a capture can be resumed after it's
+interrupted and shared between several ORBITVIS processes.
+
+Each process claims a shard, screenshots its screens, and marks it
+done once every screenshot has been written. Shards claimed by a
+process which has stopped are handed out again, either once its
+lease runs out or straight away if it ran on the same machine.
+
+Screens are numbered in the order CAPTUREMODE takes them (see
+Engine.seek_screen()). To see how far a job has got, run:
+python orbitjobs.py <job file>
+
+October 18, 2026
+'''
+
+'''
+The following resources were used as a reference:
+https://docs.python.org/3.8/library/sqlite3.html#controlling-transactions
+https://www.sqlite.org/lang_transaction.html
+https://docs.python.org/3.8/library/socket.html#socket.gethostname
+'''
+
+import sqlite3
+import sys
+
+from os.path import dirname
+from os.path import exists
+from os import getpid
+from os import kill
+from os import makedirs
+from os import name as osName
+from socket import gethostname
+from time import time
+
+EXCEPTIONjobMismatch = "Capture job file was made with different settings."
+
+#How long (in seconds) to wait for another process to finish with the job file
+JOBTIMEOUT = 60
+
+
+def capture_manifest(config):
+	'''Returns the settings a capture job's screenshots depend on,
+	as a dictionary of strings. Every process working on a job
+	has to use the same settings.'''
+
+	screens = config.MODULUS*config.MODULUS
+	if config.maxcaptures >= 0:
+		screens = min(screens, config.maxcaptures)
+
+	return {"modulus" : str(config.MODULUS), "cmode" : config.CMODE,
+	        "arrangement" : config.ARRANGEMENT, "colormode" : config.COLORMODE,
+	        "colortransient" : config.COLORTRANSIENT, "reduction" : config.REDUCTION,
+	        "size" : str(config.windowDimensions[0]) + "x" + str(config.windowDimensions[1]),
+	        "screens" : str(screens)}
+
+
+def owner_alive(owner):
+	'''Returns False if owner (hostname:pid) was a process on this
+	machine which has since stopped, or True otherwise.'''
+
+	host, pid = owner.rsplit(":", 1)
+	if host != gethostname() or osName != "posix":
+		return True
+
+	try:
+		kill(int(pid), 0)
+	except ProcessLookupError:
+		return False
+	except OSError:
+		pass
+
+	return True
+
+
+class CaptureJob:
+	'''A capture split into shards of shardSize screens, kept in an SQLite
+	database at path. The job is set up from manifest the first time the
+	file is opened; after that, manifest has to match what's in the file.
+
+	A shard whose owner hasn't checked in for lease seconds is assumed
+	to have stopped, and can be claimed again.'''
+
+	def __init__(self, path, manifest, shardSize, lease):
+		if dirname(path) != "" and not exists(dirname(path)):
+			makedirs(dirname(path))
+
+		#Transactions are started by hand, so that claiming a shard is atomic
+		self.database = sqlite3.connect(path, timeout=JOBTIMEOUT, isolation_level=None)
+		self.lease = lease
+		self.owner = gethostname() + ":" + str(getpid())
+
+		self.database.execute("BEGIN IMMEDIATE")
+		self.database.execute("CREATE TABLE IF NOT EXISTS manifest (name TEXT PRIMARY KEY, value TEXT)")
+		self.database.execute('''CREATE TABLE IF NOT EXISTS shards (
+			shard INTEGER PRIMARY KEY, start INTEGER, stop INTEGER,
+			state TEXT, owner TEXT, checkin REAL)''')
+
+		saved = dict(self.database.execute("SELECT name, value FROM manifest").fetchall())
+		if saved == {}:
+			self.database.executemany("INSERT INTO manifest VALUES (?, ?)", manifest.items())
+
+			screens = int(manifest["screens"])
+			self.database.executemany("INSERT INTO shards VALUES (?, ?, ?, 'pending', '', 0)",
+				[(s, start, min(start + shardSize, screens))
+				 for s, start in enumerate(range(0, screens, shardSize))])
+
+		elif saved != manifest:
+			self.database.execute("ROLLBACK")
+			self.database.close()
+			raise Exception(EXCEPTIONjobMismatch)
+
+		self.database.execute("COMMIT")
+
+
+	def claim(self):
+		'''Claims a shard which nobody is working on. Returns
+		(shard, start, stop), or None if there aren't any left.'''
+
+		self.database.execute("BEGIN IMMEDIATE")
+
+		row = self.database.execute('''SELECT shard, start, stop FROM shards
+			WHERE state='pending' ORDER BY shard LIMIT 1''').fetchone()
+
+		#Otherwise, take over a shard from a process which has stopped
+		if row is None:
+			for shard, start, stop, owner, checkin in self.database.execute('''SELECT shard, start,
+				stop, owner, checkin FROM shards WHERE state='claimed' ORDER BY shard''').fetchall():
+
+				if checkin < time() - self.lease or not owner_alive(owner):
+					row = (shard, start, stop)
+					break
+
+		if row is not None:
+			self.database.execute("UPDATE shards SET state='claimed', owner=?, checkin=? WHERE shard=?",
+				(self.owner, time(), row[0]))
+
+		self.database.execute("COMMIT")
+		return row
+
+
+	def check_in(self, shard):
+		'''Lets other processes know this one is still working on shard.'''
+
+		self.database.execute("UPDATE shards SET checkin=? WHERE shard=? AND owner=?",
+			(time(), shard, self.owner))
+
+
+	def finish(self, shard):
+		'''Marks shard as done. Only call this once every screenshot in
+		the shard has been written.'''
+
+		self.database.execute("UPDATE shards SET state='done' WHERE shard=? AND owner=?",
+			(shard, self.owner))
+
+
+	def release(self, shard):
+		'''Gives up on shard, so another process can claim it straight away.'''
+
+		self.database.execute("UPDATE shards SET state='pending', owner='' WHERE shard=? AND owner=?",
+			(shard, self.owner))
+
+
+	def progress(self):
+		'''Returns how many shards are pending, claimed and done.'''
+
+		counts = dict(self.database.execute("SELECT state, COUNT(*) FROM shards GROUP BY state").fetchall())
+		return [counts.get(state, 0) for state in ["pending", "claimed", "done"]]
+
+
+	def close(self):
+		'''Closes the job file.'''
+
+		self.database.close()
+
+
+if __name__ == "__main__":
+	if len(sys.argv) < 2 or not exists(sys.argv[1]):
+		print("Usage: python orbitjobs.py <job file>")
+		quit()
+
+	database = sqlite3.connect(sys.argv[1])
+	for name, value in database.execute("SELECT name, value FROM manifest ORDER BY name"):
+		print(name + ":", value)
+
+	counts = dict(database.execute("SELECT state, COUNT(*) FROM shards GROUP BY state").fetchall())
+	print("Shards:", counts.get("pending", 0), "pending,", counts.get("claimed", 0), "claimed,",
+	      counts.get("done", 0), "done")
+
+	for shard, start, stop, owner, checkin in database.execute('''SELECT shard, start, stop,
+		owner, checkin FROM shards WHERE state='claimed' ORDER BY shard'''):
+		print("Shard", shard, "(screens", start, "to", str(stop - 1) + ") claimed by", owner,
+		      "{:.0f}s ago".format(time() - checkin))
+
+	database.close()
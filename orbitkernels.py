@@ -0,0 +1,199 @@
+'''
+The backends ORBITVIS uses for its orbit kernels.
+The "c" backend calls LINCELLAUT's shared library,
+while the "numpy" backend needs nothing compiled.
+
+October 18, 2026
+'''
+
+'''
+The following resources were used as a reference:
+https://docs.python.org/3.8/library/ctypes.html?highlight=ctypes#module-ctypes
+https://numpy.org/doc/stable/reference/generated/numpy.ndarray.max.html
+'''
+
+from ctypes import *
+
+import numpy as np
+
+from orbitmath import matrix_multiply
+from orbitmath import matrix_orbit_info
+from orbitmath import matrix_orbit_info_many
+from orbitmath import matrix_power
+from orbitmath import vector_cycle_length
+
+BACKENDcatalogue = ["c", "numpy"]
+EXCEPTIONunknownBACKEND = "Unknown backend passed in config file."
+
+
+def load_library(objectPath):
+	'''Loads orbitvis.so from the given directory and sets
+	the parameter types for the functions we use.'''
+
+	sharedC = CDLL(objectPath + "/orbitvis.so")
+
+	sharedC.C_step.argtypes = [c_int, c_int, POINTER((c_int * 2) * 2), c_int, c_int]
+	sharedC.C_step.restype = c_int
+
+	sharedC.get_orbit_info.argtypes = [POINTER(c_int * 2), POINTER((c_int * 2) * 2), c_int]
+	sharedC.get_orbit_info.restype = c_int
+
+	sharedC.get_orbit_info_array.argtypes = [POINTER((c_int * 2) * 2), c_int]
+	sharedC.get_orbit_info_array.restype = c_int
+
+	sharedC.C_iterate_matrix.argtypes = [POINTER((c_int * 2) * 2), POINTER((c_int * 2) * 2), c_int]
+	sharedC.C_iterate_matrix.restype = None
+
+	return sharedC
+
+
+def set_screen_matrix(theMatrix, x, y, arrangement):
+	'''Sets the entries of theMatrix which vary across an "iterall"
+	screen to those of the tile at (x, y).'''
+
+	if arrangement == "nondiag":
+		theMatrix[0][0] = x
+		theMatrix[1][1] = y
+	elif arrangement == "diag":
+		theMatrix[0][1] = x
+		theMatrix[1][0] = y
+
+
+class CBackend:
+	'''Runs the kernels in orbitvis.so.
+
+	Every backend has the four kernels C_step, get_orbit_info,
+	get_orbit_info_array and C_iterate_matrix, which take and return
+	the same things as the functions in orbitvis.so, as well as
+	orbit_info_rows for computing part of an "iterall" screen.
+
+	chunkTiles is roughly how many tiles orbit_info_rows should be given
+	at once when a screen is worked out a few rows at a time.'''
+
+	#Each tile takes about as long however many are computed at once
+	chunkTiles = 1024
+
+	def __init__(self, objectPath):
+		self.sharedC = load_library(objectPath)
+
+		self.C_step = self.sharedC.C_step
+		self.get_orbit_info = self.sharedC.get_orbit_info
+		self.get_orbit_info_array = self.sharedC.get_orbit_info_array
+		self.C_iterate_matrix = self.sharedC.C_iterate_matrix
+
+
+	def orbit_info_rows(self, F, modulus, arrangement, xStart, xStop):
+		'''Returns [omega, tau] for the tiles in rows xStart to xStop-1
+		of the "iterall" screen containing F. The entries of F which
+		vary across the screen are changed in place.'''
+
+		rows = np.zeros((xStop - xStart, modulus, 2), dtype=np.int64)
+
+		for x in range(xStart, xStop):
+			for y in range(0, modulus):
+				set_screen_matrix(F, x, y, arrangement)
+
+				#The two is from rows(F)
+				rows[x - xStart, y] = divmod(self.get_orbit_info_array(F, modulus), 2*modulus)
+
+		return rows
+
+
+class NumpyBackend:
+	'''Runs the same kernels as CBackend in Python and NumPy,
+	for when orbitvis.so hasn't been built.
+
+	"iterall" screens are computed for every tile at once.'''
+
+	#Every tile is iterated until the slowest one is done,
+	# so small batches waste a lot of work
+	chunkTiles = 4096
+
+	def C_step(self, x, y, F, modulus, iterations):
+		'''Returns where <x, y> lands after the given number of
+		iterations, encoded as x*modulus + y.'''
+
+		FPower = matrix_power(F, iterations, modulus)
+		return ((FPower[0][0]*x + FPower[0][1]*y) % modulus)*modulus + \
+		       (FPower[1][0]*x + FPower[1][1]*y) % modulus
+
+
+	def get_orbit_info(self, vect, F, modulus):
+		'''Returns the cycle length of vect's orbit under F.'''
+
+		return vector_cycle_length(vect, F, modulus)
+
+
+	def get_orbit_info_array(self, F, modulus):
+		'''Returns the cycle and transient lengths of F, encoded
+		as omega*2*modulus + tau.'''
+
+		omega, tau = matrix_orbit_info(F, modulus)
+		return omega*2*modulus + tau
+
+
+	def C_iterate_matrix(self, F, currentF, modulus):
+		'''Sets currentF to F*currentF mod modulus.'''
+
+		product = matrix_multiply(F, currentF, modulus)
+		for x in range(0, 2):
+			for y in range(0, 2):
+				currentF[x][y] = product[x][y]
+
+
+	def orbit_info_rows(self, F, modulus, arrangement, xStart, xStop):
+		'''Same as CBackend.orbit_info_rows, but every tile is
+		computed at once. F isn't changed.'''
+
+		rowX, rowY = np.indices((xStop - xStart, modulus))
+		rowX += xStart
+
+		screenMatrices = np.empty((4, rowX.size), dtype=np.int64)
+		screenMatrices[0] = F[0][0]
+		screenMatrices[1] = F[0][1]
+		screenMatrices[2] = F[1][0]
+		screenMatrices[3] = F[1][1]
+		set_screen_matrix(screenMatrices.reshape(2, 2, -1), rowX.ravel(), rowY.ravel(), arrangement)
+
+		omega, tau = self.get_orbit_info_many(screenMatrices, modulus)
+		return np.stack([omega, tau], axis=-1).reshape(xStop - xStart, modulus, 2)
+
+
+	def get_orbit_info_many(self, matrices, modulus):
+		'''Returns the cycle and transient lengths of many matrices at
+		once, as two arrays. matrices[i] holds entry i of each matrix,
+		reading row by row.'''
+
+		return matrix_orbit_info_many(matrices, modulus)
+
+
+def make_backend(backendName, objectPath):
+	'''Returns the backend with the given name.'''
+
+	if backendName == "c":
+		return CBackend(objectPath)
+	elif backendName == "numpy":
+		return NumpyBackend()
+
+	raise Exception(EXCEPTIONunknownBACKEND)
+
+
+def orbit_info_screen(backend, F, modulus, arrangement):
+	'''Returns the cycle and transient lengths of every matrix on
+	the current "iterall" screen as an array of shape
+	(modulus, modulus, 2), where [x][y] holds [omega, tau].
+
+	The entries of F which vary across the screen are
+	left as they are after the last tile.'''
+
+	screenInfo = backend.orbit_info_rows(F, modulus, arrangement, 0, modulus)
+	set_screen_matrix(F, modulus - 1, modulus - 1, arrangement)
+
+	return screenInfo
+
+
+def screen_maxima(screenInfo):
+	'''Returns the largest omega and tau on a screen, which are
+	used to normalise the colours in "iterall".'''
+
+	return [int(screenInfo[..., 0].max()), int(screenInfo[..., 1].max())]
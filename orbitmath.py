@@ -0,0 +1,328 @@
+'''
+Vectorised helpers for ORBITVIS. These let us
+work on every vector in the plane at once instead
+of calling into the C library once per vector.
+
+October 18, 2026
+'''
+
+'''
+The following resources were used as a reference:
+https://numpy.org/doc/stable/reference/generated/numpy.indices.html
+https://numpy.org/doc/stable/user/basics.broadcasting.html
+'''
+
+from math import gcd
+
+import numpy as np
+
+
+#Vector states are stored as int32 to halve the memory they take.
+#Products of two entries stay below 2^31 for moduli up to 32768.
+STATETYPE = np.int32
+
+
+def identity_plane(modulus):
+	'''Returns the initial state of every vector in the plane.
+
+	The result has shape (modulus, modulus, 2), where [x][y]
+	holds the vector <x, y>.'''
+
+	return np.stack(np.indices((modulus, modulus), dtype=STATETYPE), axis=-1)
+
+
+def step_plane(states, F, modulus):
+	'''Applies the update matrix F once to every vector state in
+	the plane, returning the new states. Gives the same results as
+	calling C_step on each vector individually.'''
+
+	vectX = states[..., 0]
+	vectY = states[..., 1]
+
+	#Reducing F first keeps the products within STATETYPE
+	newStates = np.empty_like(states)
+	newStates[..., 0] = ((F[0][0] % modulus)*vectX + (F[0][1] % modulus)*vectY) % modulus
+	newStates[..., 1] = ((F[1][0] % modulus)*vectX + (F[1][1] % modulus)*vectY) % modulus
+
+	return newStates
+
+
+def prime_power_factors(modulus):
+	'''Returns the prime powers whose product is modulus,
+	smallest prime first. 1 has no factors.'''
+
+	factors = []
+	prime = 2
+	while prime*prime <= modulus:
+		if modulus % prime == 0:
+			primePower = 1
+			while modulus % prime == 0:
+				modulus //= prime
+				primePower *= prime
+			factors.append(primePower)
+		prime += 1
+
+	if modulus > 1:
+		factors.append(modulus)
+
+	return factors
+
+
+def plane_visitors(states, x, y):
+	'''Returns the vectors whose state is currently <x, y>, as
+	an array of shape (visitors, 2).'''
+
+	return np.argwhere((states[..., 0] == x) & (states[..., 1] == y))
+
+
+def is_invertible(F, modulus):
+	'''Returns True if F is invertible mod modulus.'''
+
+	return gcd((F[0][0]*F[1][1] - F[0][1]*F[1][0]) % modulus, modulus) == 1
+
+
+def frames_until_initial(F, modulus, omega, startIteration):
+	'''Returns how many frames CAPTUREMODE takes to bring the plane back
+	to its initial state, including the repeated plane at the end.
+	omega is the cycle length of F, and startIteration is the iteration
+	the capture starts from.
+
+	The plane is back at its initial state exactly when the current
+	power of F is the identity. This only happens if F is invertible,
+	in which case omega is the multiplicative order of F. Returns -1
+	if the plane never gets back to its initial state.'''
+
+	if not is_invertible(F, modulus):
+		return -1
+
+	#The first frame of a capture starting at 0 is the initial state
+	# itself, and doesn't count. Otherwise, the first frame shows
+	# iteration startIteration+1.
+	if startIteration == 0:
+		return omega + 1
+
+	return (-(startIteration + 1)) % omega + 1
+
+
+def matrix_multiply(A, B, modulus):
+	'''Returns A*B mod modulus, as a list of rows.'''
+
+	return [[(A[r][0]*B[0][c] + A[r][1]*B[1][c]) % modulus for c in range(0, 2)]
+	        for r in range(0, 2)]
+
+
+def matrix_power(F, power, modulus):
+	'''Returns F^power mod modulus, as a list of rows.
+
+	Uses repeated squaring, so this only takes about
+	2*log2(power) matrix products.'''
+
+	result = [[1 % modulus, 0], [0, 1 % modulus]]
+	square = [[F[0][0] % modulus, F[0][1] % modulus], [F[1][0] % modulus, F[1][1] % modulus]]
+
+	while power > 0:
+		if power % 2 == 1:
+			result = matrix_multiply(square, result, modulus)
+		square = matrix_multiply(square, square, modulus)
+		power //= 2
+
+	return result
+
+
+def plane_cycle_lengths(F, modulus):
+	'''Returns the length of the cycle each vector's orbit falls into,
+	as an array of shape (modulus, modulus).
+
+	F maps the plane to itself, so it forms a functional graph where
+	every vector points to where it lands. Vectors which nothing lands
+	on can't be on a cycle, so these are peeled off layer by layer
+	until only the cycles are left. Each cycle is labelled by its
+	smallest vector using pointer doubling, and then the peeled vectors
+	take the cycle length of where they land, last layer first.'''
+
+	vectorCount = modulus*modulus
+	landing = step_plane(identity_plane(modulus), F, modulus)
+	successor = (landing[..., 0]*modulus + landing[..., 1]).ravel()
+
+	#Peeling off vectors which aren't on a cycle
+	onCycle = np.ones(vectorCount, dtype=bool)
+	visitors = np.bincount(successor, minlength=vectorCount)
+	layers = []
+	layer = np.flatnonzero(visitors == 0)
+	while layer.size > 0:
+		layers.append(layer)
+		onCycle[layer] = False
+
+		targets = successor[layer]
+		visitors -= np.bincount(targets, minlength=vectorCount)
+		targets = np.unique(targets)
+		layer = targets[visitors[targets] == 0]
+
+	#Labelling each cycle by its smallest vector. After each round, a
+	# vector's label covers twice as much of its cycle as before, and
+	# once no label changes, every label covers its whole cycle.
+	cycleVectors = np.flatnonzero(onCycle)
+	position = np.zeros(vectorCount, dtype=np.int64)
+	position[cycleVectors] = np.arange(cycleVectors.size)
+
+	label = np.arange(cycleVectors.size)
+	jump = position[successor[cycleVectors]]
+	while True:
+		newLabel = np.minimum(label, label[jump])
+		if (newLabel == label).all():
+			break
+		label = newLabel
+		jump = jump[jump]
+
+	cycleLengths = np.zeros(vectorCount, dtype=np.int64)
+	cycleLengths[cycleVectors] = np.bincount(label)[label]
+
+	for layer in reversed(layers):
+		cycleLengths[layer] = cycleLengths[successor[layer]]
+
+	return cycleLengths.reshape(modulus, modulus)
+
+
+def multiply_many(A, B, modulus):
+	'''Multiplies many matrices at once. A and B have shape (4, N),
+	holding the entries of each matrix row-wise. Returns A*B mod modulus
+	in the same form.'''
+
+	return np.stack([
+	(A[0]*B[0] + A[1]*B[2]) % modulus,
+	(A[0]*B[1] + A[1]*B[3]) % modulus,
+	(A[2]*B[0] + A[3]*B[2]) % modulus,
+	(A[2]*B[1] + A[3]*B[3]) % modulus])
+
+
+def power_many(A, powers, modulus):
+	'''Raises each matrix in A (shape (4, N)) to the matching entry
+	of powers mod modulus, using repeated squaring.'''
+
+	result = np.zeros_like(A)
+	result[0] = 1 % modulus
+	result[3] = 1 % modulus
+
+	square = A.copy()
+	powers = powers.copy()
+	while (powers > 0).any():
+		odd = powers % 2 == 1
+		result[:, odd] = multiply_many(square[:, odd], result[:, odd], modulus)
+		square = multiply_many(square, square, modulus)
+		powers //= 2
+
+	return result
+
+
+def matrix_orbit_info_many(A, modulus):
+	'''Returns the cycle and transient lengths (omega, tau) of the
+	sequence F, F^2, F^3, ... for every matrix F in A (shape (4, N)).
+
+	Uses Brent's cycle detection on every matrix at once. Matrices
+	drop out of the working set as soon as their cycle is found.'''
+
+	A = np.asarray(A, dtype=np.int64) % modulus
+	count = A.shape[1]
+	omega = np.zeros(count, dtype=np.int64)
+	tau = np.zeros(count, dtype=np.int64)
+
+	#Finding omega
+	active = np.arange(count)
+	F = A
+	tortoise = A.copy()
+	hare = multiply_many(A, A, modulus)
+	power = np.ones(count, dtype=np.int64)
+	lam = np.ones(count, dtype=np.int64)
+
+	while active.size > 0:
+		found = (tortoise == hare).all(axis=0)
+		if found.any():
+			omega[active[found]] = lam[found]
+
+			searching = ~found
+			active = active[searching]
+			F = F[:, searching]
+			tortoise = tortoise[:, searching]
+			hare = hare[:, searching]
+			power = power[searching]
+			lam = lam[searching]
+
+		restart = power == lam
+		if restart.any():
+			tortoise[:, restart] = hare[:, restart]
+			power[restart] *= 2
+			lam[restart] = 0
+
+		hare = multiply_many(F, hare, modulus)
+		lam += 1
+
+	#Finding tau, by walking two matrices omega apart until they meet
+	active = np.arange(count)
+	F = A
+	tortoise = A.copy()
+	hare = power_many(A, omega + 1, modulus)
+
+	while active.size > 0:
+		searching = ~(tortoise == hare).all(axis=0)
+		active = active[searching]
+		F = F[:, searching]
+		tortoise = multiply_many(F, tortoise[:, searching], modulus)
+		hare = multiply_many(F, hare[:, searching], modulus)
+		tau[active] += 1
+
+	return omega, tau
+
+
+def matrix_orbit_info(F, modulus):
+	'''Returns the cycle and transient lengths (omega, tau) of the
+	sequence F, F^2, F^3, ... for a single matrix. This is quicker
+	than matrix_orbit_info_many when there's only one matrix.'''
+
+	F = [[F[0][0] % modulus, F[0][1] % modulus], [F[1][0] % modulus, F[1][1] % modulus]]
+
+	#Finding omega
+	power = 1
+	omega = 1
+	tortoise = F
+	hare = matrix_multiply(F, F, modulus)
+	while tortoise != hare:
+		if power == omega:
+			tortoise = hare
+			power *= 2
+			omega = 0
+		hare = matrix_multiply(F, hare, modulus)
+		omega += 1
+
+	#Finding tau
+	tau = 0
+	tortoise = F
+	hare = matrix_power(F, omega + 1, modulus)
+	while tortoise != hare:
+		tortoise = matrix_multiply(F, tortoise, modulus)
+		hare = matrix_multiply(F, hare, modulus)
+		tau += 1
+
+	return omega, tau
+
+
+def vector_cycle_length(vect, F, modulus):
+	'''Returns the length of the cycle the orbit of vect under F
+	falls into, using Brent's cycle detection.'''
+
+	def step(v):
+		return ((F[0][0]*v[0] + F[0][1]*v[1]) % modulus, (F[1][0]*v[0] + F[1][1]*v[1]) % modulus)
+
+	power = 1
+	lam = 1
+	tortoise = (vect[0] % modulus, vect[1] % modulus)
+	hare = step(tortoise)
+
+	while tortoise != hare:
+		if power == lam:
+			tortoise = hare
+			power *= 2
+			lam = 0
+		hare = step(hare)
+		lam += 1
+
+	return lam
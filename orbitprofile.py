@@ -0,0 +1,172 @@
+'''
+Optional per-frame timing for ORBITVIS. When the "profile"
+key is in the .config file, each frame's phases are timed,
+calls to the backend's kernels are counted, and rolling averages
+are shown in the window's caption. A range of frames can also be
+run under cProfile and saved for later viewing.
+
+When profiling is off, a NoProfiler is used instead, whose
+methods do nothing.
+
+October 18, 2026
+'''
+
+'''
+The following resources were used as a reference:
+https://docs.python.org/3.8/library/profile.html#profile.Profile
+https://docs.python.org/3.8/library/collections.html#collections.deque
+https://docs.python.org/3.8/library/time.html#time.perf_counter
+'''
+
+import cProfile
+from collections import deque
+from time import perf_counter
+
+#The kernels every backend has (see orbitkernels.py)
+KERNELS = ["C_step", "get_orbit_info", "get_orbit_info_array", "C_iterate_matrix"]
+
+#Kernels only some backends have, which work on many matrices in one call
+BATCHKERNELS = ["get_orbit_info_many"]
+
+#How many of the latest frames the averages are taken over
+ROLLINGFRAMES = 30
+
+
+def count_calls(backend, calls):
+	'''Wraps the backend's kernels so that each call is counted in calls,
+	a dictionary keyed by the names in KERNELS and BATCHKERNELS. Calls
+	made inside worker processes aren't counted.'''
+
+	def counted(name, kernel):
+		def wrapper(*args):
+			calls[name] += 1
+			return kernel(*args)
+		return wrapper
+
+	for name in KERNELS + BATCHKERNELS:
+		if hasattr(backend, name):
+			setattr(backend, name, counted(name, getattr(backend, name)))
+
+
+class NoProfiler:
+	'''Stands in for FrameProfiler when profiling is off.'''
+
+	def begin_frame(self):
+		pass
+
+	def start(self, phase):
+		pass
+
+	def stop(self, phase):
+		pass
+
+	def end_frame(self):
+		pass
+
+	def summary(self, label=" |"):
+		return ""
+
+	def close(self):
+		pass
+
+
+class FrameProfiler:
+	'''Times the phases of each frame, and counts the kernel calls
+	made during it. If dumpPath isn't empty, frames firstFrame to
+	lastFrame (counting from 1) are run under cProfile, and the
+	results are saved to dumpPath once lastFrame ends.'''
+
+	def __init__(self, backend, dumpPath="", firstFrame=-1, lastFrame=-1):
+		self.calls = {name : 0 for name in KERNELS + BATCHKERNELS}
+		count_calls(backend, self.calls)
+
+		self.dumpPath = dumpPath
+		self.firstFrame = firstFrame
+		self.lastFrame = lastFrame
+		self.cProfiler = None
+
+		self.frame = 0
+		self.phaseStarts = {}
+		self.frameTimes = {}
+		self.frameCalls = 0
+		self.history = {}
+		self.callHistory = deque(maxlen=ROLLINGFRAMES)
+
+
+	def begin_frame(self):
+		'''Starts timing a new frame.'''
+
+		self.frame += 1
+		self.frameTimes = {}
+		self.frameCalls = sum(self.calls.values())
+
+		if self.dumpPath != "" and self.frame == self.firstFrame:
+			self.cProfiler = cProfile.Profile()
+			self.cProfiler.enable()
+
+
+	def start(self, phase):
+		'''Starts timing a phase of the current frame.'''
+
+		self.phaseStarts[phase] = perf_counter()
+
+
+	def stop(self, phase):
+		'''Stops timing a phase. A phase can be timed more than
+		once per frame, in which case the times are added up.'''
+
+		elapsed = perf_counter() - self.phaseStarts.pop(phase)
+		self.frameTimes[phase] = self.frameTimes.get(phase, 0) + elapsed
+
+
+	def end_frame(self):
+		'''Finishes the current frame, adding it to the averages.'''
+
+		for phase in self.frameTimes:
+			if phase not in self.history:
+				self.history[phase] = deque(maxlen=ROLLINGFRAMES)
+			self.history[phase].append(self.frameTimes[phase])
+
+		self.callHistory.append(sum(self.calls.values()) - self.frameCalls)
+
+		if self.cProfiler is not None and self.frame == self.lastFrame:
+			self.cProfiler.disable()
+			self.cProfiler.dump_stats(self.dumpPath)
+			self.cProfiler = None
+			print("Profile of frames", self.firstFrame, "to", self.lastFrame, "saved to", self.dumpPath)
+
+
+	def summary(self, label=" |"):
+		'''Returns the average time of each phase, and the average
+		number of kernel calls, over the latest frames, after label.'''
+
+		if len(self.callHistory) == 0:
+			return ""
+
+		text = label
+		for phase in self.history:
+			text += " " + phase + " {:.1f}ms".format(1000*sum(self.history[phase])/len(self.history[phase]))
+		text += " calls {:.0f}".format(sum(self.callHistory)/len(self.callHistory))
+
+		return text
+
+
+	def close(self):
+		'''Saves the cProfile results if the chosen frames
+		were cut short.'''
+
+		if self.cProfiler is not None:
+			self.cProfiler.disable()
+			self.cProfiler.dump_stats(self.dumpPath)
+			self.cProfiler = None
+			print("Profile of frames", self.firstFrame, "to", self.frame, "saved to", self.dumpPath)
+
+
+def make_profiler(config, backend):
+	'''Returns a FrameProfiler if config asks for profiling,
+	or a NoProfiler otherwise.'''
+
+	if not config.PROFILE:
+		return NoProfiler()
+
+	return FrameProfiler(backend, config.PROFILEPATH, config.PROFILEFRAMES[0], config.PROFILEFRAMES[1])
@@ -0,0 +1,149 @@
+'''
+Works out "cycles" planes and "iterall" screens in a background
+thread, so that ORBITVIS' window stays responsive while they're
+computed. The finished rows are shown as they come in, and a job
+can be cancelled as soon as the user moves somewhere else.
+
+While the window is idle, the "iterall" screens next to the
+current one can be prefetched into the engine's screen cache.
+
+October 18, 2026
+'''
+
+'''
+The following resources were used as a reference:
+https://docs.python.org/3.8/library/threading.html#thread-objects
+'''
+
+from threading import Thread
+
+from orbitengine import copy_matrix
+
+
+class PlaneJob(Thread):
+	'''Computes the plane for the engine's current update matrix using
+	Engine.plane_progress(). The main thread calls show() every so often
+	to put the latest progress on the engine.
+
+	Once cancelled, the job stops after the chunk of rows it's working on,
+	and nothing more is shown. Chunks already handed to worker processes
+	still finish in the background.
+
+	If previous is given, this job waits for it to stop before starting,
+	so that skipping past several planes quickly only wastes the one
+	chunk that was being worked on.'''
+
+	def __init__(self, engine, previous=None):
+		Thread.__init__(self, daemon=True)
+
+		self.engine = engine
+		self.previous = previous
+
+		#The engine's F can change while we're working, so use a copy
+		self.F = copy_matrix(engine.F)
+
+		self.cancelled = False
+		self.finished = False
+		self.error = None
+
+		#The latest progress, and how many times it's been updated
+		self.latest = None
+		self.updates = 0
+		self.shownUpdates = 0
+		self.shownFinished = False
+
+
+	def run(self):
+		if self.previous is not None:
+			self.previous.join()
+			self.previous = None
+
+		#Skipped past before it even started
+		if self.cancelled:
+			return
+
+		try:
+			for screenInfo in self.engine.plane_progress(self.F):
+				if self.cancelled:
+					return
+
+				self.latest = screenInfo
+				self.updates += 1
+
+			self.finished = True
+
+		except Exception as error:
+			self.error = error
+
+
+	def show(self):
+		'''Puts the latest progress on the engine. Returns True if the
+		plane changed since this was last called. Raises whatever went
+		wrong in the job, if anything did.'''
+
+		if self.error is not None:
+			raise self.error
+
+		#finished is read first, so that if it's set, latest
+		# is certainly the whole plane
+		finished = self.finished
+		updates = self.updates
+		if self.cancelled or (updates == self.shownUpdates and finished == self.shownFinished):
+			return False
+
+		self.shownUpdates = updates
+		self.shownFinished = finished
+		self.engine.show_screen(self.latest, finished)
+
+		return True
+
+
+	def done(self):
+		'''Returns True once there's nothing more to show.'''
+
+		return self.cancelled or self.error is not None or self.shownFinished
+
+
+	def cancel(self):
+		'''Stops the job. Its results are never shown.'''
+
+		self.cancelled = True
+
+
+class PrefetchJob(Thread):
+	'''Works out the "iterall" screens next to the engine's current one
+	which aren't cached yet, and stores them in the engine's screen cache.
+	Cancelling works the same as for PlaneJob.'''
+
+	def __init__(self, engine, previous=None):
+		Thread.__init__(self, daemon=True)
+
+		self.engine = engine
+		self.previous = previous
+		self.neighbours = engine.neighbour_screens()
+		self.cancelled = False
+		self.error = None
+
+
+	def run(self):
+		if self.previous is not None:
+			self.previous.join()
+			self.previous = None
+
+		try:
+			for F in self.neighbours:
+				for screenInfo in self.engine.plane_progress(F):
+					if self.cancelled:
+						return
+
+				self.engine.screenCache.store(F, self.engine.modulus,
+				                              self.engine.config.ARRANGEMENT, screenInfo)
+
+		except Exception as error:
+			self.error = error
+
+
+	def cancel(self):
+		'''Stops the job after the chunk of rows it's working on.'''
+
+		self.cancelled = True
@@ -0,0 +1,644 @@
+'''
+Draws the vector plane into a pixel buffer in one go,
+rather than drawing each tile with its own rect. The
+result matches drawing the tiles one by one in order.
+
+draw_plane() and make_caption() draw an Engine's plane
+(see orbitengine.py) and describe it.
+
+A Viewport zooms in on part of the plane. Zoomed views are
+drawn from a pyramid of the plane's colours at halving levels of
+detail, so drawing them takes time in proportion to the window's
+size rather than to the number of tiles.
+
+October 18, 2026
+'''
+
+'''
+The following resources were used as a reference:
+https://www.pygame.org/docs/ref/surfarray.html#pygame.surfarray.blit_array
+https://numpy.org/doc/stable/reference/generated/numpy.ufunc.at.html
+https://numpy.org/doc/stable/reference/generated/numpy.ufunc.reduce.html
+https://en.wikipedia.org/wiki/Mipmap
+'''
+
+from math import floor
+from math import log
+
+import numpy as np
+
+import pygame
+
+WHITE = (255, 255, 255)
+
+CAPTION = "ORBITVIS"
+
+#The fewest tiles a Viewport can zoom in to across
+MINVIEWTILES = 2
+
+#Repainting tiles one by one is slower per pixel than drawing the whole
+# plane, so once the tiles to repaint cover more than this fraction of
+# the surface, the whole plane is drawn instead
+REPAINTLIMIT = 0.5
+
+
+def relative_colors(values, maxValue, modulus):
+	'''Scales values linearly so that maxValue maps to modulus-1.
+	Used by COLORMODE "relative".'''
+
+	return (values.astype(np.int64)*(modulus-1))//maxValue
+
+
+def rellog_colors(values, maxValue, modulus):
+	'''Scales values logarithmically so that maxValue maps to modulus-1.
+	Used by COLORMODE "rellog".
+
+	Only the distinct values are put through log(), so the
+	results are exactly the same as scaling each value on its own.'''
+
+	distinct, where = np.unique(values, return_inverse=True)
+	scaled = np.array([floor(log(value+1, maxValue+1)*(modulus-1)) for value in distinct.tolist()],
+	                  dtype=np.int64)
+
+	return scaled[where].reshape(values.shape)
+
+
+def color_levels(modulus):
+	'''Returns the brightness each value from 0 to modulus-1 maps to.
+	Vector <x, y> is coloured (levels[x], levels[y], 0).'''
+
+	return ((255*np.arange(modulus))//modulus).astype(np.uint8)
+
+
+def tile_colors(levels, colorX, colorY):
+	'''Returns the colour of each tile as an array of shape
+	(tiles, 3), looking colorX and colorY up in levels.'''
+
+	colors = np.zeros((colorX.size, 3), dtype=np.uint8)
+	colors[:, 0] = levels[colorX.ravel()]
+	colors[:, 1] = levels[colorY.ravel()]
+
+	return colors
+
+
+def axis_cover(starts, lengths, size):
+	'''Given where each tile starts along one axis and how many pixels
+	long it is, returns the lowest and highest tile covering each
+	pixel along that axis. Uncovered pixels have a highest tile of -1.'''
+
+	tiles = np.arange(len(starts))
+	lowest = np.full(size, len(starts), dtype=np.int64)
+	highest = np.full(size, -1, dtype=np.int64)
+
+	for offset in range(0, max(int(lengths.max()), 0)):
+		covering = lengths > offset
+		pixels = starts[covering] + offset
+		inside = (pixels >= 0) & (pixels < size)
+
+		np.minimum.at(lowest, pixels[inside], tiles[covering][inside])
+		np.maximum.at(highest, pixels[inside], tiles[covering][inside])
+
+	return lowest, highest
+
+
+def span_max(values, lowest, highest):
+	'''For each pixel, returns the largest entry of values (along its
+	first axis) over the tiles covering that pixel, or -1 if none do.'''
+
+	result = np.full((len(lowest),) + values.shape[1:], -1, dtype=np.int64)
+
+	covered = highest >= 0
+	if not covered.any():
+		return result
+
+	for offset in range(0, int((highest - lowest)[covered].max()) + 1):
+		tiles = lowest + offset
+		valid = covered & (tiles <= highest)
+		result[valid] = np.maximum(result[valid], values[tiles[valid]])
+
+	return result
+
+
+def axis_runs(lowest, highest):
+	'''Splits the pixels along one axis into runs covered by the same
+	tiles (see axis_cover()). Returns the first pixel of each run and
+	how many pixels long it is.'''
+
+	changes = np.ones(len(lowest), dtype=bool)
+	changes[1:] = (lowest[1:] != lowest[:-1]) | (highest[1:] != highest[:-1])
+
+	firsts = np.flatnonzero(changes)
+	return firsts, np.diff(np.append(firsts, len(lowest)))
+
+
+def tile_layout(size, xStart, yStart, tileSize, extendX, extendY):
+	'''Works out where a grid of tiles goes on a surface of the given size
+	(see blit_tiles()). Returns, for the columns of tiles and then for the
+	rows, where each starts and how many pixels long it is, followed by
+	the lowest and highest tile covering each pixel (see axis_cover()).'''
+
+	xTiles = np.arange(len(extendX))
+	yTiles = np.arange(len(extendY))
+
+	#Same rounding pygame uses when given a rect with float values
+	xStarts = np.trunc(xStart + xTiles*tileSize).astype(np.int64)
+	xLengths = np.trunc(tileSize + extendX).astype(np.int64)
+	yStarts = np.trunc(yStart - (yTiles+1)*tileSize).astype(np.int64)
+	yLengths = np.trunc(tileSize + extendY).astype(np.int64)
+
+	return ((xStarts, xLengths) + axis_cover(xStarts, xLengths, size[0]),
+	        (yStarts, yLengths) + axis_cover(yStarts, yLengths, size[1]))
+
+
+def blit_tiles(surface, drawOrder, drawColors, xStart, yStart, tileSize, extendX, extendY):
+	'''Draws a grid of tiles onto surface.
+
+	drawOrder[x][y] says when the tile at <x, y> was drawn (-1 if it
+	wasn't), and drawColors holds the colour of each draw, in order.
+	Tiles drawn later cover earlier ones, and tile <x, y> is extended by
+	extendX[x] and extendY[y] pixels, like the rects draw_plane used to draw.
+	Everything not covered by a tile is left white.
+
+	Pixels covered by the same tiles are the same colour, so one cell is
+	coloured for each run of them, and the cells are then stretched out
+	to the surface's size.'''
+
+	width, height = surface.get_size()
+
+	xLayout, yLayout = tile_layout((width, height), xStart, yStart, tileSize, extendX, extendY)
+	xLowest, xHighest = xLayout[2:]
+	yLowest, yHighest = yLayout[2:]
+
+	xFirsts, xCounts = axis_runs(xLowest, xHighest)
+	yFirsts, yCounts = axis_runs(yLowest, yHighest)
+
+	#Latest draw covering each run of columns, then each cell
+	columns = span_max(drawOrder, xLowest[xFirsts], xHighest[xFirsts])
+	cells = span_max(columns.T, yLowest[yFirsts], yHighest[yFirsts]).T
+
+	cellColors = np.empty(cells.shape + (3,), dtype=np.uint8)
+	cellColors[...] = WHITE
+
+	drawn = cells >= 0
+	cellColors[drawn] = drawColors[cells[drawn]]
+
+	pixelColors = np.repeat(np.repeat(cellColors, xCounts, axis=0), yCounts, axis=1)
+	pygame.surfarray.blit_array(surface, pixelColors)
+
+
+def repaint_tiles(surface, tilesX, tilesY, drawOrder, drawColors, xLayout, yLayout):
+	'''Redraws only the pixels of the tiles at <tilesX[i], tilesY[i]>, giving
+	the same result as blit_tiles() would there. Each pixel has to be covered
+	by at most two tiles along each axis. Returns the rect that was redrawn.'''
+
+	width, height = surface.get_size()
+	xStarts, xLengths, xLowest, xHighest = xLayout
+	yStarts, yLengths, yLowest, yHighest = yLayout
+
+	#Every pixel of every tile, as one long list
+	offsetsX = np.arange(xLengths.max())
+	offsetsY = np.arange(yLengths.max())
+	pixelX = xStarts[tilesX][:, None, None] + offsetsX[None, :, None]
+	pixelY = yStarts[tilesY][:, None, None] + offsetsY[None, None, :]
+
+	inside = (offsetsX[None, :, None] < xLengths[tilesX][:, None, None]) & \
+	         (offsetsY[None, None, :] < yLengths[tilesY][:, None, None]) & \
+	         (pixelX >= 0) & (pixelX < width) & (pixelY >= 0) & (pixelY < height)
+
+	pixelX, pixelY = np.broadcast_arrays(pixelX, pixelY)
+	pixelX = pixelX[inside]
+	pixelY = pixelY[inside]
+	if len(pixelX) == 0:
+		return None
+
+	#Latest draw covering each pixel, out of the (at most) four tiles covering it
+	pixels = np.full(len(pixelX), -1, dtype=np.int64)
+	for tileX in [xLowest[pixelX], xHighest[pixelX]]:
+		for tileY in [yLowest[pixelY], yHighest[pixelY]]:
+			pixels = np.maximum(pixels, drawOrder[tileX, tileY])
+
+	#Index -1 (tiles which weren't drawn) looks up white
+	colors = np.append(drawColors, [WHITE], axis=0).astype(np.uint8)
+
+	surfacePixels = pygame.surfarray.pixels3d(surface)
+	surfacePixels[pixelX, pixelY] = colors[pixels]
+	del surfacePixels
+
+	return pygame.Rect(int(pixelX.min()), int(pixelY.min()),
+	                   int(pixelX.max() - pixelX.min()) + 1, int(pixelY.max() - pixelY.min()) + 1)
+
+
+class PlaneCanvas:
+	'''Remembers how draw_plane() last drew tiles onto a surface, so that in
+	"iterstate" with "drag" or "repaint", the next frame only repaints the
+	tiles which could have changed colour. Nothing else may be drawn over
+	the plane in between, or forget() must be called.'''
+
+	def __init__(self):
+		self.forget()
+
+
+	def forget(self):
+		'''Makes the next frame be drawn in full.'''
+
+		#(surface size, xStart, yStart, tileSize) of the last frame
+		self.layoutKey = None
+		self.xLayout = None
+		self.yLayout = None
+		self.repaintable = False
+
+
+	def draw(self, surface, engine, xStart, yStart, tileSize):
+		'''Draws the plane as blit_tiles() would, repainting only the tiles
+		vectors moved to or from if it can. Returns the rect that changed,
+		or None if nothing did.'''
+
+		#Always asked for, so that the engine knows what was drawn
+		moved, previous = engine.moved_vectors()
+
+		drawOrder, drawColors, extendX, extendY = plane_colors(engine)
+
+		layoutKey = (surface.get_size(), xStart, yStart, tileSize)
+		if layoutKey != self.layoutKey:
+			self.layoutKey = layoutKey
+			self.xLayout, self.yLayout = tile_layout(surface.get_size(), xStart, yStart,
+			                                         tileSize, extendX, extendY)
+			moved = None
+
+			#Repainting a tile only works if no pixel is covered by more than
+			# two tiles along each axis, which holds once tiles are a pixel wide
+			self.repaintable = all((layout[3] - layout[2])[layout[3] >= 0].max(initial=0) <= 1
+			                       for layout in [self.xLayout, self.yLayout])
+
+		if moved is None or not self.repaintable:
+			blit_tiles(surface, drawOrder, drawColors, xStart, yStart, tileSize, extendX, extendY)
+			return surface.get_rect()
+
+		#Roughly how many pixels each moved vector costs to repaint
+		width, height = surface.get_size()
+		tilePixels = self.xLayout[1].max()*self.yLayout[1].max()
+
+		if np.count_nonzero(moved)*tilePixels > REPAINTLIMIT*width*height:
+			blit_tiles(surface, drawOrder, drawColors, xStart, yStart, tileSize, extendX, extendY)
+			return surface.get_rect()
+
+		#A "repaint" tile changes when its vector moves, while in "drag"
+		# it's the tiles a vector moved from and to that change
+		changed = moved
+		if engine.config.COLORMODE == "drag":
+			changed = np.zeros_like(moved)
+			for states in [previous[moved], engine.vectorStates[moved]]:
+				changed[states[:, 0], states[:, 1]] = True
+
+		tilesX, tilesY = np.nonzero(changed)
+		if len(tilesX) == 0:
+			return None
+
+		return repaint_tiles(surface, tilesX, tilesY, drawOrder, drawColors, self.xLayout, self.yLayout)
+
+
+def plane_colors(engine):
+	'''Works out how the vector plane is drawn, with vectors moved to their
+	appropriate location after iters iterations. Returns drawOrder and
+	drawColors, as used by blit_tiles(), and how far each column and row
+	of tiles is extended.'''
+
+	CMODE = engine.config.CMODE
+	COLORMODE = engine.config.COLORMODE
+	COLORTRANSIENT = engine.config.COLORTRANSIENT
+	MODULUS = engine.modulus
+
+	#Tiles are drawn one pixel wider than they need to be. This
+	# helps remove white grid lines on the plot resulting from
+	# floating point rounding inconsistencies
+	extendX = np.ones(MODULUS)
+	extendY = np.ones(MODULUS)
+	if COLORMODE == "repaint" or (COLORMODE == "drag" and CMODE != "iterplane"):
+		extendX[MODULUS-1] = 0
+		extendY[MODULUS-1] = 0
+
+	#Getting appropriate vectors for drawing the squares
+	planeStates = engine.plane_states()
+
+	#Tiles are drawn in order, left to right, bottom to top
+	drawOrder = np.arange(MODULUS*MODULUS).reshape(MODULUS, MODULUS)
+
+	if COLORMODE == "drag":
+		#Each vector is drawn where it lands instead, so
+		# the last vector to land on a tile is the one we see
+		landed = np.full((MODULUS, MODULUS), -1)
+		np.maximum.at(landed, (planeStates[..., 0], planeStates[..., 1]), drawOrder)
+		drawOrder = landed
+
+		colorX = np.indices((MODULUS, MODULUS))[0]
+		colorY = np.indices((MODULUS, MODULUS))[1]
+
+	elif COLORMODE == "repaint":
+		colorX = planeStates[..., 0]
+		colorY = planeStates[..., 1]
+
+	#Now determining the proper colours to use for the display
+	else:
+		colorX = np.zeros((MODULUS, MODULUS), dtype=planeStates.dtype)
+		colorY = np.zeros((MODULUS, MODULUS), dtype=planeStates.dtype)
+
+		if COLORMODE == "relative":
+			scale_colors = relative_colors
+		elif COLORMODE == "rellog":
+			scale_colors = rellog_colors
+
+		#MODULUS-1 prevents colorX and colorY from going over MODULUS
+		if CMODE == "cycles":
+			matrixOmega, matrixTau = engine.matrix_orbit_info(engine.F)
+			colorX = scale_colors(planeStates[..., 0], matrixOmega, MODULUS)
+
+		#iterall
+		else:
+			#Screens still being worked out can be blank
+			if engine.maxInfo[0] != 0 and COLORTRANSIENT != "solo":
+				colorX = scale_colors(planeStates[..., 0], engine.maxInfo[0], MODULUS)
+
+			if engine.maxInfo[1] != 0 and COLORTRANSIENT != "none":
+				colorY = scale_colors(planeStates[..., 1], engine.maxInfo[1], MODULUS)
+
+	drawColors = tile_colors(color_levels(MODULUS), colorX, colorY)
+
+	return drawOrder, drawColors, extendX, extendY
+
+
+def draw_plane(surface, engine, viewport=None, canvas=None):
+	'''Draws the vector plane as a square, as big as fits on surface,
+	in the middle of it. If viewport is given, only the part of the
+	plane it shows is drawn.
+
+	The tiles are coloured into a pixel buffer all at once, which is
+	then copied onto the surface. When the whole plane is shown and its
+	tiles are at least a pixel wide (or the reduction is "last"), it's
+	drawn tile by tile. Otherwise it's drawn from the viewport's
+	pyramid (see draw_view()).
+
+	If canvas (a PlaneCanvas) is given, tiles which can't have changed
+	since it was last used are left alone. Returns the rect of surface
+	which changed, or None if nothing did.'''
+
+	MODULUS = engine.modulus
+
+	windowDimensions = surface.get_size()
+	gridSize = min(windowDimensions)
+
+	xStart = (windowDimensions[0] - gridSize) / 2
+	yStart = (windowDimensions[1] + gridSize) / 2
+	tileSize = gridSize/MODULUS
+
+	if viewport is not None and (not viewport.is_full() or
+	                             (tileSize < 1 and engine.config.REDUCTION != "last")):
+		draw_view(surface, engine, viewport)
+		if canvas is not None:
+			canvas.forget()
+		return surface.get_rect()
+
+	if canvas is not None:
+		return canvas.draw(surface, engine, xStart, yStart, tileSize)
+
+	drawOrder, drawColors, extendX, extendY = plane_colors(engine)
+
+	#Finally, we draw the squares
+	blit_tiles(surface, drawOrder, drawColors, xStart, yStart, tileSize, extendX, extendY)
+	return surface.get_rect()
+
+
+def pool_level(values, reduce):
+	'''Combines each 2x2 block of cells in values (along its first two
+	axes) with reduce, a NumPy ufunc. Odd edges are padded with zeros.'''
+
+	padX = values.shape[0] % 2
+	padY = values.shape[1] % 2
+	if padX or padY:
+		values = np.pad(values, [(0, padX), (0, padY)] + [(0, 0)]*(values.ndim - 2))
+
+	blocks = values.reshape((values.shape[0]//2, 2, values.shape[1]//2, 2) + values.shape[2:])
+	return reduce.reduce(reduce.reduce(blocks, axis=3), axis=1)
+
+
+def build_pyramid(drawOrder, drawColors, reduction, maxKeys=None):
+	'''Returns the colour of each tile, then of each 2x2 block of tiles,
+	then of each 4x4 block, and so on until a single cell is left. Blocks
+	are coloured using the given reduction (see Config.REDUCTION), and
+	tiles which weren't drawn count as white.
+
+	For "max", the tile with the largest entry of maxKeys (a non-negative
+	value for each tile) is used, or the most red tile if it isn't given.'''
+
+	#Index -1 (tiles which weren't drawn) looks up white
+	colors = np.append(drawColors, [WHITE], axis=0).astype(np.uint8)
+	levels = [colors[drawOrder]]
+
+	if reduction == "mean":
+		sums = levels[0].astype(np.float64)
+		counts = np.ones(drawOrder.shape)
+		while max(sums.shape[:2]) > 1:
+			sums = pool_level(sums, np.add)
+			counts = pool_level(counts, np.add)
+			levels.append(np.round(sums/counts[..., np.newaxis]).astype(np.uint8))
+
+		return levels
+
+	#Otherwise each cell keeps the draw with the largest key, where
+	# 0 means nothing was drawn
+	draws = len(drawColors) + 1
+	keys = drawOrder.astype(np.int64) + 1
+	if reduction == "max":
+		if maxKeys is None:
+			maxKeys = levels[0][..., 0]
+		keys[drawOrder >= 0] += maxKeys[drawOrder >= 0].astype(np.int64)*draws
+
+	while max(keys.shape) > 1:
+		keys = pool_level(keys, np.maximum)
+		levels.append(colors[keys % draws - 1])
+
+	return levels
+
+
+def draw_view(surface, engine, viewport):
+	'''Draws the part of the plane viewport shows, sampling each pixel
+	from the first level of the pyramid whose cells are at least a
+	pixel wide. The pyramid is built when it's first needed.'''
+
+	width, height = surface.get_size()
+	gridSize, xStart, yStart, tileSize = viewport.grid(surface.get_size())
+
+	if viewport.levels is None:
+		drawOrder, drawColors, extendX, extendY = plane_colors(engine)
+
+		#Tiles with the longest cycles are kept, even if they aren't coloured by them
+		maxKeys = None
+		if engine.config.CMODE in ["cycles", "iterall"]:
+			maxKeys = engine.plane_states()[..., 0]
+
+		viewport.levels = build_pyramid(drawOrder, drawColors, engine.config.REDUCTION, maxKeys)
+
+	level = 0
+	while level + 1 < len(viewport.levels) and tileSize*2**level < 1:
+		level += 1
+	cells = viewport.levels[level]
+
+	#Which tile the middle of each column and row of pixels lands on
+	tileX = np.floor(viewport.viewX + (np.arange(width) + 0.5 - xStart)/tileSize).astype(np.int64)
+	tileY = np.floor(viewport.viewY + (yStart - np.arange(height) - 0.5)/tileSize).astype(np.int64)
+
+	insideX = (tileX >= 0) & (tileX < viewport.modulus) & (np.arange(width) >= xStart) & \
+	          (np.arange(width) < xStart + gridSize)
+	insideY = (tileY >= 0) & (tileY < viewport.modulus) & (np.arange(height) < yStart) & \
+	          (np.arange(height) >= yStart - gridSize)
+
+	pixelColors = np.empty((width, height, 3), dtype=np.uint8)
+	pixelColors[...] = WHITE
+	pixelColors[np.ix_(insideX, insideY)] = cells[np.ix_(tileX[insideX] >> level, tileY[insideY] >> level)]
+
+	pygame.surfarray.blit_array(surface, pixelColors)
+
+
+class Viewport:
+	'''Which part of a modulus x modulus plane is shown. (viewX, viewY) is
+	where the bottom left corner of the view is, in tiles, and span is how
+	many tiles fit across it. Neither needs to be a whole number.
+
+	levels holds the pyramid the view is drawn from (see build_pyramid()).
+	It must be cleared with invalidate() whenever the plane changes.'''
+
+	def __init__(self, modulus):
+		self.modulus = modulus
+		self.levels = None
+		self.reset()
+
+
+	def reset(self):
+		'''Shows the whole plane again.'''
+
+		self.viewX = 0
+		self.viewY = 0
+		self.span = self.modulus
+
+
+	def invalidate(self):
+		'''Throws away the pyramid, since the plane has changed.'''
+
+		self.levels = None
+
+
+	def is_full(self):
+		'''Returns True if the whole plane is shown.'''
+
+		return self.span == self.modulus
+
+
+	def grid(self, surfaceSize):
+		'''Returns the size of the square the view is drawn in on a surface
+		of the given size, where its left and bottom edges are, and how many
+		pixels wide each tile is.'''
+
+		gridSize = min(surfaceSize)
+		return (gridSize, (surfaceSize[0] - gridSize) / 2, (surfaceSize[1] + gridSize) / 2,
+		        gridSize/self.span)
+
+
+	def point_at(self, pos, surfaceSize):
+		'''Returns where the pixel pos is on the plane, in tiles.'''
+
+		gridSize, xStart, yStart, tileSize = self.grid(surfaceSize)
+		return self.viewX + (pos[0] - xStart)/tileSize, self.viewY + (yStart - pos[1])/tileSize
+
+
+	def tile_at(self, pos, surfaceSize):
+		'''Returns the vector [x, y] of the tile under the pixel pos,
+		or None if pos isn't on the plane.'''
+
+		gridSize, xStart, yStart, tileSize = self.grid(surfaceSize)
+		if not (pos[0] > xStart and pos[0] < xStart + gridSize and
+		        pos[1] > yStart - gridSize and pos[1] < yStart):
+			return None
+
+		#Counted down from the top, the same way the plane is drawn
+		above = self.modulus - self.viewY - self.span
+		x = floor(self.viewX + (pos[0] - xStart)/tileSize)
+		y = self.modulus - floor(above + (pos[1] - (yStart - gridSize))/tileSize) - 1
+
+		return [min(max(x, 0), self.modulus - 1), min(max(y, 0), self.modulus - 1)]
+
+
+	def tile_rect(self, tile, surfaceSize):
+		'''Returns the rect covering the given tile, cut down to the
+		part of it that's in view.'''
+
+		gridSize, xStart, yStart, tileSize = self.grid(surfaceSize)
+
+		#min() functions adjust the width to match the underlying square
+		rect = pygame.Rect(
+		xStart + (tile[0] - self.viewX)*tileSize,
+		yStart - (tile[1] + 1 - self.viewY)*tileSize,
+		tileSize + min(1, self.modulus-1-tile[0]),
+		tileSize + min(1, self.modulus-1-tile[1]))
+
+		if self.is_full():
+			return rect
+
+		return rect.clip(pygame.Rect(xStart, yStart - gridSize, gridSize, gridSize))
+
+
+	def clamp(self):
+		'''Keeps the view on the plane.'''
+
+		self.viewX = min(max(self.viewX, 0), self.modulus - self.span)
+		self.viewY = min(max(self.viewY, 0), self.modulus - self.span)
+
+
+	def zoom(self, factor, pointX, pointY):
+		'''Zooms in by factor (or out, if it's less than 1), keeping the
+		point (pointX, pointY) on the plane in the same place.'''
+
+		span = min(max(self.span/factor, min(MINVIEWTILES, self.modulus)), self.modulus)
+		if span == self.modulus:
+			self.reset()
+			return
+
+		self.viewX = pointX - (pointX - self.viewX)*span/self.span
+		self.viewY = pointY - (pointY - self.viewY)*span/self.span
+		self.span = span
+		self.clamp()
+
+
+	def pan(self, across, up):
+		'''Moves the view across and up by the given number of tiles.'''
+
+		self.viewX += across
+		self.viewY += up
+		self.clamp()
+
+
+def make_caption(engine):
+	'''Returns a caption for the window containing iterations,
+	the modulus, and the update matrix.'''
+
+	CMODE = engine.config.CMODE
+	ARRANGEMENT = engine.config.ARRANGEMENT
+	MODULUS = engine.modulus
+	F = engine.F
+
+	if CMODE != "iterall":
+		cap = CAPTION + " - "
+		if CMODE != "cycles":
+			cap += "i" + str(engine.iterations)
+		cap += "m" + str(MODULUS) + "F" + \
+		str(F[0][0]) + str(F[0][1]) + str(F[1][0]) + str(F[1][1])
+
+	else:
+		if ARRANGEMENT == "nondiag":
+			cap = CAPTION + " - m" + str(MODULUS) + " from F0" + \
+			str(F[0][1]) + str(F[1][0]) + "0 to F" + str(MODULUS) + \
+			str(F[0][1]) + str(F[1][0]) + str(MODULUS)
+		elif ARRANGEMENT == "diag":
+			cap = CAPTION + " - m" + str(MODULUS) + " from F" + str(F[0][0]) + \
+			"00" + str(F[1][1]) + " to F" + str(F[0][0]) + str(MODULUS) + \
+			str(MODULUS) + str(F[1][1])
+
+	return cap
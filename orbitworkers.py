@@ -0,0 +1,113 @@
+'''
+Splits "iterall" screens across several worker processes.
+Each worker sets up its own backend (loading its own copy of
+orbitvis.so for the "c" backend) and keeps its own matrix
+buffer, so tiles can be computed in parallel.
+
+October 18, 2026
+'''
+
+'''
+The following resources were used as a reference:
+https://docs.python.org/3.8/library/multiprocessing.html#module-multiprocessing.pool
+https://docs.python.org/3.8/library/multiprocessing.html#contexts-and-start-methods
+https://docs.python.org/3.8/library/multiprocessing.html#multiprocessing.pool.AsyncResult
+'''
+
+import multiprocessing
+
+from collections import deque
+from ctypes import *
+
+import numpy as np
+
+from orbitkernels import make_backend
+from orbitkernels import set_screen_matrix
+
+#Each worker fills these in when it starts
+workerBackend = None
+workerF = None
+
+#How many pieces each worker's share of the screen is split into.
+#More pieces balance the load better when some rows take longer.
+CHUNKSPERWORKER = 4
+
+#How many pieces each worker can have waiting at once.
+#Pieces which have already been handed out can't be taken back.
+QUEUEDPERWORKER = 2
+
+
+def init_worker(backendName, objectPath):
+	'''Sets up the backend and makes a matrix buffer
+	for this worker process.'''
+
+	global workerBackend
+	global workerF
+
+	workerBackend = make_backend(backendName, objectPath)
+	workerF = ((c_int * 2) * 2)()
+
+
+def screen_rows(job):
+	'''Computes omega and tau for rows xStart to xStop-1 of an
+	"iterall" screen. Returns xStart along with the rows.'''
+
+	entries, modulus, arrangement, xStart, xStop = job
+
+	for x in range(0, 2):
+		for y in range(0, 2):
+			workerF[x][y] = entries[x][y]
+
+	return xStart, workerBackend.orbit_info_rows(workerF, modulus, arrangement, xStart, xStop)
+
+
+def make_pool(backendName, objectPath, workers):
+	'''Returns a pool of worker processes for computing "iterall"
+	screens, or None if this platform can't fork processes.
+
+	Workers are forked rather than spawned, since spawning would
+	rerun orbitvis.py (and open a window) in every worker.'''
+
+	if "fork" not in multiprocessing.get_all_start_methods():
+		return None
+
+	context = multiprocessing.get_context("fork")
+	return context.Pool(workers, init_worker, (backendName, objectPath))
+
+
+def screen_row_chunks(pool, workers, F, modulus, arrangement):
+	'''Shares the rows of an "iterall" screen out between the processes
+	in pool, yielding (xStart, rows) for each chunk of rows in order.
+
+	Only a few chunks are handed out at a time, so if the caller stops
+	early, not much work is left running in the pool.'''
+
+	entries = [[F[0][0], F[0][1]], [F[1][0], F[1][1]]]
+
+	chunkCount = min(modulus, workers*CHUNKSPERWORKER)
+	bounds = [(modulus*c)//chunkCount for c in range(0, chunkCount + 1)]
+	jobs = [(entries, modulus, arrangement, bounds[c], bounds[c+1])
+	        for c in range(0, chunkCount)]
+
+	pending = deque()
+	nextJob = 0
+	while nextJob < chunkCount or len(pending) > 0:
+		while nextJob < chunkCount and len(pending) < workers*QUEUEDPERWORKER:
+			pending.append(pool.apply_async(screen_rows, (jobs[nextJob],)))
+			nextJob += 1
+
+		yield pending.popleft().get()
+
+
+def orbit_info_screen_parallel(pool, workers, F, modulus, arrangement):
+	'''Same as orbit_info_screen, but the rows of the screen are
+	shared out between the processes in pool.'''
+
+	screenInfo = np.zeros((modulus, modulus, 2), dtype=np.int64)
+	for xStart, rows in screen_row_chunks(pool, workers, F, modulus, arrangement):
+		screenInfo[xStart:xStart + len(rows)] = rows
+
+	#Leave F how the serial version would
+	set_screen_matrix(F, modulus - 1, modulus - 1, arrangement)
+
+	return screenInfo